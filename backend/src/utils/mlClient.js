@@ -21,3 +21,16 @@ export async function personalizeScore({ grade, subject, difficulty }) {
     return { score: 0.5, label: 'neutral' };
   }
 }
+
+export async function personalizeScores(items) {
+  // items: [{ grade, subject, difficulty }] -> scores in the same order
+  if (!items || items.length === 0) return [];
+  try {
+    const { data } = await axios.post(`${cfg.mlUrl}/infer/batch`,
+      items.map(({ grade, subject, difficulty }) => ({ grade, subject, difficulty })),
+      { timeout: 3000 });
+    return (data && data.results) || items.map(() => ({ score: 0.5, label: 'neutral' }));
+  } catch {
+    return items.map(() => ({ score: 0.5, label: 'neutral' }));
+  }
+}
@@ -1,54 +1,160 @@
-from fastapi import FastAPI
-from schemas.adapt import AdaptRequest, AdaptResponse
-from schemas.translate import TranslateRequest, TranslateResponse
+import asyncio
+import json
+import time
+from fastapi import FastAPI, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from schemas.adapt import AdaptRequest, AdaptResponse, BulkCulturalAdaptRequest, BulkCulturalAdaptResponse
+from schemas.translate import TranslateRequest, TranslateResponse, MultiTranslateRequest, MultiTranslateResponse
 from utils.logger import get_logger
-from collectors.user_collector import collect_user
-from collectors.device_collector import collect_device
-from collectors.content_collector import collect_content
-from transformers.locale_deriver import derive_locale
-from transformers.difficulty_smoother import smooth_difficulty
+from utils.sse import sse
+from utils.metrics import CACHE_EVENTS, FALLBACKS, REQUEST_SECONDS, component_stats
+from utils.tracing import start_trace, end_trace
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from transformers.personalization_bridge import attach_personalization
 from transformers.cultural_adapter import apply_cultural_adaptation
-from prompt.builder import build_prompt, postprocess
-from clients.openai_client import chat_adapt
-from services.cultural_adaptation import adapt_content
-from services.translation import translate_text
-from configs.settings import PORT
+from prompt.builder import build_prompt
+from prompt.stream import StreamPostprocessor
+from clients.openai_client import chat_adapt_stream, llm_flight, llm_stats
+from clients.http_pool import start_pool, close_pool
+from clients.ml_client import score_cache
+from services.cultural_adaptation import adapt_content, adapt_content_bulk
+from services.translation import translate_text, translate_text_stream, translate_multi, translate_multi_iter
+from services.adaptation import normalize_context, fallback_text, run_adaptation, DEFAULT_PERSONALIZATION
+from services.adaptation_cache import adapt_cache
+from configs.settings import PORT, ADAPT_ML_DEADLINE, TRACE_REQUESTS
 
 app = FastAPI(title="EduMorph MCP Service")
 log = get_logger("mcp")
 
+@app.on_event("startup")
+async def open_http_pool():
+    await start_pool()
+
+@app.on_event("shutdown")
+async def close_http_pool():
+    await close_pool()
+
+component_stats.add("llm_singleflight", llm_flight.stats)
+component_stats.add("llm_limits", llm_stats)
+component_stats.add("adapt_cache", adapt_cache.stats)
+component_stats.add("ml_scores", score_cache.stats)
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    """
+    Latency histogram per route. With TRACE_REQUESTS, or per request with an
+    `X-Trace: 1` header, stage spans are collected and logged as one JSON
+    line and the response carries X-Trace-Id. Streaming responses are timed
+    until their headers go out.
+    """
+    trace = token = None
+    if TRACE_REQUESTS or request.headers.get("x-trace"):
+        trace, token = start_trace(request.headers.get("x-trace-id"))
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        REQUEST_SECONDS.labels(request.method, route, str(status)).observe(time.perf_counter() - started)
+        if trace is not None:
+            end_trace(token)
+            log.info(json.dumps(trace.to_dict(method=request.method, route=route, status=status)))
+    if trace is not None:
+        response.headers["X-Trace-Id"] = trace.id
+    return response
+
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/health")
 def health():
     return {"ok": True, "service": "mcp-service"}
 
+@app.get("/stats")
+def stats():
+    return {"llm_singleflight": llm_flight.stats(), "llm_limits": llm_stats(), "adapt_cache": adapt_cache.stats(), "ml_scores": score_cache.stats()}
+
 @app.post("/adapt", response_model=AdaptResponse)
-async def adapt(req: AdaptRequest):
-    ctx = req.context
-    ctx.user = collect_user(ctx.user)
-    ctx.device = collect_device(ctx.device)
-    ctx.content = collect_content(ctx.content)
-
-    ctx = derive_locale(ctx)
-    ctx = smooth_difficulty(ctx)
-    ctx = apply_cultural_adaptation(ctx)
-    personalization = await attach_personalization(ctx)
-
-    prompt = build_prompt(ctx, req.lesson_content, personalization)
-    adapted = await chat_adapt(prompt)
-    if not adapted:
-        adapted = f"[Fallback] {ctx.user.preferred_language}/{ctx.user.region}/g{ctx.user.grade}\n{req.lesson_content}"
-    adapted = postprocess(ctx, adapted)
-
-    return AdaptResponse(
-        adapted_text=adapted,
-        cached=False,
-        personalization_score=personalization.get("score"),
-        personalization_label=personalization.get("label"),
-        language=ctx.user.preferred_language,
-        region=ctx.user.region,
-        grade=ctx.user.grade
-    )
+async def adapt(req: AdaptRequest, response: Response):
+    t0 = time.perf_counter()
+    ctx, cache_key = normalize_context(req)
+    hit = adapt_cache.get(cache_key)
+    prep_ms = (time.perf_counter() - t0) * 1000
+    CACHE_EVENTS.labels("adapt", "hit" if hit is not None else "miss").inc()
+    if hit is not None:
+        response.headers["Server-Timing"] = f"prepare;dur={prep_ms:.1f}"
+        return AdaptResponse(**hit, cached=True)
+
+    result, _, run = await run_adaptation(ctx, req.lesson_content, cache_key)
+    response.headers["Server-Timing"] = f"prepare;dur={prep_ms:.1f}, " + run.server_timing()
+    return AdaptResponse(**result, cached=False)
+
+@app.post("/adapt/stream")
+async def adapt_stream(req: AdaptRequest):
+    """
+    Streaming variant of /adapt. Emits server-sent events: `meta` once the
+    personalization is known, then `data` events with {"delta": text} as the
+    completion arrives (postprocess policies applied line by line), then `done`.
+    """
+    ctx, cache_key = normalize_context(req)
+    hit = adapt_cache.get(cache_key)
+    CACHE_EVENTS.labels("adapt", "hit" if hit is not None else "miss").inc()
+
+    async def events():
+        if hit is not None:
+            yield sse({k: v for k, v in hit.items() if k != "adapted_text"} | {"cached": True}, "meta")
+            yield sse({"delta": hit["adapted_text"]})
+            yield sse({"cached": True}, "done")
+            return
+
+        c = apply_cultural_adaptation(ctx)
+        try:
+            personalization = await asyncio.wait_for(attach_personalization(c), ADAPT_ML_DEADLINE)
+        except asyncio.TimeoutError:
+            personalization = DEFAULT_PERSONALIZATION
+        meta = dict(
+            personalization_score=personalization.get("score"),
+            personalization_label=personalization.get("label"),
+            language=c.user.preferred_language,
+            region=c.user.region,
+            grade=c.user.grade
+        )
+        yield sse(meta | {"cached": False}, "meta")
+
+        pp = StreamPostprocessor(c)
+        sent = []
+        from_llm = False
+        try:
+            async for delta in chat_adapt_stream(build_prompt(c, req.lesson_content, personalization)):
+                from_llm = True
+                out = pp.feed(delta)
+                if out:
+                    sent.append(out)
+                    yield sse({"delta": out})
+        except Exception as e:
+            log.error(f"Streaming adapt error: {str(e)}")
+            if from_llm:
+                yield sse({"error": "upstream stream interrupted"}, "error")
+                return
+        if not from_llm:
+            FALLBACKS.labels("adapt_stream_llm").inc()
+            out = pp.feed(fallback_text(c, req.lesson_content))
+            if out:
+                sent.append(out)
+                yield sse({"delta": out})
+        tail = pp.close()
+        if tail:
+            sent.append(tail)
+            yield sse({"delta": tail})
+        if from_llm:
+            adapt_cache.set(cache_key, dict(meta, adapted_text="".join(sent)))
+        yield sse({"cached": False}, "done")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 @app.post("/cultural-adapt", response_model=AdaptResponse)
 async def cultural_adapt(req: AdaptRequest):
@@ -59,6 +165,14 @@ async def cultural_adapt(req: AdaptRequest):
     # Apply the cultural adaptation service
     return adapt_content(req)
 
+@app.post("/cultural-adapt/bulk", response_model=BulkCulturalAdaptResponse)
+def cultural_adapt_bulk(req: BulkCulturalAdaptRequest):
+    """
+    Generate N distinct culturally adapted items (e.g. a worksheet) for one
+    context in a single call
+    """
+    return adapt_content_bulk(req)
+
 @app.post("/translate", response_model=TranslateResponse)
 async def translate(req: TranslateRequest):
     """
@@ -67,6 +181,41 @@ async def translate(req: TranslateRequest):
     """
     return await translate_text(req)
 
+@app.post("/translate/stream")
+async def translate_stream(req: TranslateRequest):
+    """
+    Streaming variant of /translate, relayed as server-sent events
+    (`meta`, {"delta": text}..., `done`)
+    """
+    async def events():
+        yield sse({"source_language": req.source_language or "en", "target_language": req.target_language}, "meta")
+        async for delta in translate_text_stream(req):
+            yield sse({"delta": delta})
+        yield sse({}, "done")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/translate/multi", response_model=MultiTranslateResponse)
+async def translate_multi_endpoint(req: MultiTranslateRequest):
+    """
+    Translate one text into several target languages in one call; the
+    per-language LLM calls run concurrently
+    """
+    return MultiTranslateResponse(source_language=req.source_language or "en", results=await translate_multi(req))
+
+@app.post("/translate/multi/stream")
+async def translate_multi_stream(req: MultiTranslateRequest):
+    """
+    Streaming variant of /translate/multi: one `result` event per language
+    in completion order, then `done`
+    """
+    async def events():
+        async for result in translate_multi_iter(req):
+            yield sse(jsonable_encoder(result), "result")
+        yield sse({}, "done")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app:app", host="0.0.0.0", port=PORT, reload=True)
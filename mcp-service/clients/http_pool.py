@@ -0,0 +1,39 @@
+from typing import Optional
+import httpx
+from configs.settings import HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY, HTTP2_ENABLED
+
+# One keep-alive pool for every outbound call (OpenAI, ml-service), opened on
+# app startup and closed on shutdown. Timeouts are set per request by each client.
+_client: Optional[httpx.AsyncClient] = None
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+async def start_pool() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED and _http2_available(),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _client
+
+async def close_pool():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared client, opening it lazily for scripts that skip app startup."""
+    if _client is None or _client.is_closed:
+        return await start_pool()
+    return _client
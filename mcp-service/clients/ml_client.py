@@ -1,12 +1,44 @@
-import httpx
-from ..configs.settings import ML_SERVICE_URL
+from clients.http_pool import get_client
+from configs.settings import (
+    ML_SERVICE_URL, ML_TIMEOUT, SCORE_CACHE_TTL, SCORE_CACHE_STALE, SCORE_CACHE_SIZE,
+    SCORE_VERSION_CHECK_INTERVAL, ML_BREAKER_FAILURES, ML_BREAKER_RESET,
+)
+from services.score_cache import ScoreCache
+from utils.circuit_breaker import CircuitBreaker
+
+async def _fetch_score(key: tuple) -> dict:
+    grade, subject, difficulty = key
+    c = await get_client()
+    r = await c.post(f"{ML_SERVICE_URL}/infer", json={"grade":grade,"subject":subject,"difficulty":difficulty}, timeout=ML_TIMEOUT)
+    r.raise_for_status()
+    return r.json()
+
+async def _fetch_scores(keys: list) -> list:
+    c = await get_client()
+    r = await c.post(f"{ML_SERVICE_URL}/infer/batch", json=[
+        {"grade":grade,"subject":subject,"difficulty":difficulty} for grade, subject, difficulty in keys
+    ], timeout=ML_TIMEOUT)
+    r.raise_for_status()
+    return r.json().get("results", [])
+
+async def _fetch_model_version():
+    c = await get_client()
+    r = await c.get(f"{ML_SERVICE_URL}/models/current", timeout=ML_TIMEOUT)
+    r.raise_for_status()
+    return r.json().get("version")
+
+ml_breaker = CircuitBreaker(ML_BREAKER_FAILURES, ML_BREAKER_RESET)
+score_cache = ScoreCache(
+    _fetch_score, _fetch_scores, _fetch_model_version, ml_breaker,
+    ttl=SCORE_CACHE_TTL, stale=SCORE_CACHE_STALE, maxsize=SCORE_CACHE_SIZE,
+    version_check_interval=SCORE_VERSION_CHECK_INTERVAL,
+)
 
 async def infer_score(grade: int, subject: str, difficulty: str) -> dict:
-    try:
-        async with httpx.AsyncClient(timeout=3) as c:
-            r = await c.post(f"{ML_SERVICE_URL}/infer", json={"grade":grade,"subject":subject,"difficulty":difficulty})
-            if r.status_code == 200:
-                return r.json()
-    except Exception:
-        pass
-    return {"score": 0.5, "label": "neutral"}
+    return await score_cache.get((grade, subject, difficulty))
+
+async def infer_scores(items: list[dict]) -> list[dict]:
+    """Score many (grade, subject, difficulty) items; cache misses go out in one /infer/batch call."""
+    if not items:
+        return []
+    return await score_cache.get_many([(it["grade"], it["subject"], it["difficulty"]) for it in items])
@@ -1,22 +1,148 @@
+import asyncio
+import hashlib
+import json
+import time
 import httpx
-from ..configs.settings import OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TEMPERATURE
+from clients.http_pool import get_client
+from configs.settings import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL, OPENAI_TEMPERATURE, OPENAI_TIMEOUT, OPENAI_RPM, OPENAI_TPM,
+    OPENAI_CONCURRENCY, OPENAI_MIN_CONCURRENCY, OPENAI_MAX_CONCURRENCY, OPENAI_LATENCY_TARGET,
+    OPENAI_MAX_RETRIES, OPENAI_BACKOFF_BASE, OPENAI_BACKOFF_MAX, OPENAI_QUEUE_TIMEOUT,
+)
+from utils.rate_limit import RateLimiter, AdaptiveConcurrency, retry_after, backoff_delay
+from utils.metrics import LLM_REQUESTS, record_usage
+from utils.singleflight import SingleFlight
 
-OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_URL = f"{OPENAI_BASE_URL.rstrip('/')}/chat/completions"
+SYSTEM_PROMPT = "You adapt educational content with cultural sensitivity and accuracy."
+
+# Identical prompts arriving together (e.g. a whole class opening the same
+# lesson) share a single upstream completion.
+llm_flight = SingleFlight()
+
+# Every upstream call first takes a request and its estimated tokens from the
+# RPM/TPM buckets, then a slot from the AIMD concurrency limit. Calls that
+# cannot get both before OPENAI_QUEUE_TIMEOUT raise QueueTimeout (an
+# asyncio.TimeoutError), which callers already treat as "use the fallback".
+llm_limiter = RateLimiter(OPENAI_RPM, OPENAI_TPM)
+llm_concurrency = AdaptiveConcurrency(OPENAI_CONCURRENCY, OPENAI_MIN_CONCURRENCY, OPENAI_MAX_CONCURRENCY,
+                                      OPENAI_LATENCY_TARGET)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough prompt + completion size (~4 chars per token, completion about as long as the prompt)."""
+    return 2 * (len(prompt) // 4 + 1) + 32
+
+def llm_stats() -> dict:
+    return {"rate": llm_limiter.stats(), "concurrency": llm_concurrency.stats()}
+
+async def _backoff(attempt: int, error: Exception, delay, deadline: float):
+    """Sleep before the next attempt, or re-raise when out of attempts or time."""
+    if attempt >= OPENAI_MAX_RETRIES:
+        raise error
+    if delay is None:
+        delay = backoff_delay(attempt, OPENAI_BACKOFF_BASE, OPENAI_BACKOFF_MAX)
+    if time.monotonic() + delay > deadline:
+        raise error
+    await asyncio.sleep(delay)
+
+def _payload(prompt: str, stream: bool = False) -> dict:
+    payload = {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {"role":"system","content":SYSTEM_PROMPT},
+            {"role":"user","content": prompt}
+        ],
+        "temperature": OPENAI_TEMPERATURE
+    }
+    if stream:
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}  # final chunk reports token usage
+    return payload
+
+async def _complete(prompt: str) -> str:
+    deadline = time.monotonic() + OPENAI_QUEUE_TIMEOUT
+    estimate = estimate_tokens(prompt)
+    attempt = 0
+    while True:
+        await llm_limiter.acquire(estimate, deadline)
+        async with llm_concurrency.slot(deadline) as slot:
+            try:
+                c = await get_client()
+                r = await c.post(OPENAI_URL,
+                    headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                    json=_payload(prompt),
+                    timeout=OPENAI_TIMEOUT)
+            except httpx.TransportError as e:
+                LLM_REQUESTS.labels("transport_error").inc()
+                error, delay = e, None
+            else:
+                LLM_REQUESTS.labels(str(r.status_code)).inc()
+                if r.status_code not in RETRY_STATUS:
+                    r.raise_for_status()
+                    slot.success()
+                    j = r.json()
+                    record_usage(j.get("usage"))
+                    llm_limiter.settle(estimate, (j.get("usage") or {}).get("total_tokens", estimate))
+                    return (j.get("choices", [{}])[0].get("message",{}).get("content","") or "").strip()
+                if r.status_code == 429:
+                    slot.overloaded()
+                error = httpx.HTTPStatusError(f"OpenAI returned {r.status_code}", request=r.request, response=r)
+                delay = retry_after(r.headers)
+        await _backoff(attempt, error, delay, deadline)
+        attempt += 1
 
 async def chat_adapt(prompt: str) -> str:
     if not OPENAI_API_KEY:
         return ""
-    async with httpx.AsyncClient(timeout=15) as c:
-        r = await c.post(OPENAI_URL,
-            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-            json={
-                "model": OPENAI_MODEL,
-                "messages": [
-                    {"role":"system","content":"You adapt educational content with cultural sensitivity and accuracy."},
-                    {"role":"user","content": prompt}
-                ],
-                "temperature": OPENAI_TEMPERATURE
-            })
-        r.raise_for_status()
-        j = r.json()
-        return (j.get("choices", [{}])[0].get("message",{}).get("content","") or "").strip()
+    key = hashlib.sha256(f"{OPENAI_MODEL}\0{OPENAI_TEMPERATURE}\0{prompt}".encode("utf-8")).hexdigest()
+    return await llm_flight.do(key, lambda: _complete(prompt))
+
+async def chat_adapt_stream(prompt: str):
+    """
+    Yield completion text deltas as OpenAI streams them (nothing without an
+    API key). The stream holds its concurrency slot until it ends but does
+    not feed its duration into the latency signal; retries happen only
+    before the first delta.
+    """
+    if not OPENAI_API_KEY:
+        return
+    deadline = time.monotonic() + OPENAI_QUEUE_TIMEOUT
+    estimate = estimate_tokens(prompt)
+    attempt, sent = 0, False
+    while True:
+        await llm_limiter.acquire(estimate, deadline)
+        async with llm_concurrency.slot(deadline) as slot:
+            try:
+                c = await get_client()
+                async with c.stream("POST", OPENAI_URL,
+                        headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                        json=_payload(prompt, stream=True),
+                        timeout=OPENAI_TIMEOUT) as r:
+                    LLM_REQUESTS.labels(str(r.status_code)).inc()
+                    if r.status_code not in RETRY_STATUS:
+                        r.raise_for_status()
+                        async for line in r.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:].strip()
+                            if data == "[DONE]":
+                                break
+                            chunk = json.loads(data)
+                            record_usage(chunk.get("usage"))
+                            delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+                            if delta:
+                                sent = True
+                                yield delta
+                        return
+                    if r.status_code == 429:
+                        slot.overloaded()
+                    error = httpx.HTTPStatusError(f"OpenAI returned {r.status_code}", request=r.request, response=r)
+                    delay = retry_after(r.headers)
+            except httpx.TransportError as e:
+                LLM_REQUESTS.labels("transport_error").inc()
+                if sent:
+                    raise
+                error, delay = e, None
+        await _backoff(attempt, error, delay, deadline)
+        attempt += 1
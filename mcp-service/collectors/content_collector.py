@@ -1,3 +1,3 @@
-from ..schemas.context import ContentCtx
+from schemas.context import ContentCtx
 def collect_content(base: ContentCtx) -> ContentCtx:
     return base
@@ -1,3 +1,3 @@
-from ..schemas.context import DeviceCtx
+from schemas.context import DeviceCtx
 def collect_device(base: DeviceCtx) -> DeviceCtx:
     return base
@@ -1,3 +1,3 @@
-from ..schemas.context import UserCtx
+from schemas.context import UserCtx
 def collect_user(base: UserCtx) -> UserCtx:
     return base
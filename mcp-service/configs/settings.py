@@ -3,8 +3,46 @@ from dotenv import load_dotenv
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")  # point at loadtest.mock_openai for load tests
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
 ML_SERVICE_URL = os.getenv("ML_SERVICE_URL", "http://localhost:8000")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 PORT = int(os.getenv("PORT", "8100"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "15"))
+ML_TIMEOUT = float(os.getenv("ML_TIMEOUT", "3"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1").lower() in ("1", "true", "yes")
+ADAPT_CACHE_SIZE = int(os.getenv("ADAPT_CACHE_SIZE", "2048"))
+ADAPT_CACHE_TTL = float(os.getenv("ADAPT_CACHE_TTL", "3600"))
+ADAPT_CACHE_DB = os.getenv("ADAPT_CACHE_DB", "")  # SQLite path; empty keeps the cache in memory only
+TRANSLATE_SEGMENT_CHARS = int(os.getenv("TRANSLATE_SEGMENT_CHARS", "2000"))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "4"))
+TM_ENABLED = os.getenv("TM_ENABLED", "1").lower() in ("1", "true", "yes")
+TM_DB = os.getenv("TM_DB", "")  # SQLite path for the translation memory; empty keeps it in memory
+TM_CACHE_SIZE = int(os.getenv("TM_CACHE_SIZE", "10000"))
+TM_FUZZY_THRESHOLD = float(os.getenv("TM_FUZZY_THRESHOLD", "0.75"))
+GLOSSARY_DIR = os.getenv("GLOSSARY_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "glossary"))
+CULTURAL_CONTEXTS_FILE = os.getenv("CULTURAL_CONTEXTS_FILE", "")  # optional JSON of extra/overridden regions
+ADAPT_BUDGET = float(os.getenv("ADAPT_BUDGET", "20"))  # seconds for the whole /adapt pipeline
+ADAPT_ML_DEADLINE = float(os.getenv("ADAPT_ML_DEADLINE", "0.5"))  # seconds to wait for the ML score
+SCORE_CACHE_TTL = float(os.getenv("SCORE_CACHE_TTL", "300"))  # seconds a personalization score is fresh
+SCORE_CACHE_STALE = float(os.getenv("SCORE_CACHE_STALE", "3600"))  # extra seconds it is served while refreshing
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "4096"))
+SCORE_VERSION_CHECK_INTERVAL = float(os.getenv("SCORE_VERSION_CHECK_INTERVAL", "30"))
+ML_BREAKER_FAILURES = int(os.getenv("ML_BREAKER_FAILURES", "5"))
+ML_BREAKER_RESET = float(os.getenv("ML_BREAKER_RESET", "30"))
+TRANSLATE_MULTI_CONCURRENCY = int(os.getenv("TRANSLATE_MULTI_CONCURRENCY", "8"))  # LLM calls in flight per /translate/multi
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))  # 0 disables the requests-per-minute bucket
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "200000"))  # 0 disables the tokens-per-minute bucket
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))  # starting AIMD limit
+OPENAI_MIN_CONCURRENCY = int(os.getenv("OPENAI_MIN_CONCURRENCY", "1"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "64"))
+OPENAI_LATENCY_TARGET = float(os.getenv("OPENAI_LATENCY_TARGET", "10"))  # slower calls shrink the limit
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "0.5"))
+OPENAI_BACKOFF_MAX = float(os.getenv("OPENAI_BACKOFF_MAX", "8"))
+OPENAI_QUEUE_TIMEOUT = float(os.getenv("OPENAI_QUEUE_TIMEOUT", "30"))  # how long a call may queue/retry overall
+TRACE_REQUESTS = os.getenv("TRACE_REQUESTS", "0").lower() in ("1", "true", "yes")  # else only requests sent with X-Trace: 1
@@ -0,0 +1,81 @@
+"""
+Fake ml-service for load tests: /infer, /infer/batch, /models/current and
+/health with sampled latency and error injection. Scores are a stable hash
+of the inputs, so repeated requests agree like a real model would.
+
+    python -m loadtest.fake_ml --port 9000 --latency normal:0.02,0.01
+    ML_SERVICE_URL=http://localhost:9000 python app.py
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from loadtest.latency import parse_latency
+
+
+def fake_score(item: dict) -> dict:
+    key = f"{item.get('grade')}|{item.get('subject')}|{item.get('difficulty')}".encode("utf-8")
+    score = int.from_bytes(hashlib.sha256(key).digest()[:2], "big") / 65535
+    # Same labels and thresholds as ml-service/features.py::score_label.
+    label = "low" if score < 0.4 else ("high" if score > 0.7 else "neutral")
+    return {"score": round(score, 4), "label": label}
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="fake-ml-service")
+    latency = parse_latency(args.latency)
+    stats = {"infer": 0, "infer_batch": 0, "errors": 0}
+
+    async def delay_or_fail():
+        await asyncio.sleep(latency())
+        if random.random() < args.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"ok": False, "error": "injected failure"}, status_code=503)
+        return None
+
+    @app.post("/infer")
+    async def infer(request: Request):
+        stats["infer"] += 1
+        failed = await delay_or_fail()
+        return failed or fake_score(await request.json())
+
+    @app.post("/infer/batch")
+    async def infer_batch(request: Request):
+        stats["infer_batch"] += 1
+        failed = await delay_or_fail()
+        return failed or {"results": [fake_score(it) for it in await request.json()]}
+
+    @app.get("/models/current")
+    def current_model():
+        return {"version": args.model_version}
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    @app.get("/health")
+    def health():
+        return {"ok": True, "service": "fake-ml-service"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="normal:0.02,0.01", help="see loadtest.latency.parse_latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--model-version", default="fake-1")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import math
+import random
+
+
+def parse_latency(spec: str):
+    """
+    Parse a latency distribution into a zero-argument sampler returning seconds:
+
+        fixed:0.5            always 0.5s
+        uniform:0.2,1.5      uniform between the bounds
+        normal:0.8,0.2       mean, stddev (clipped at 0)
+        lognormal:0.8,0.5    median, sigma of the underlying normal (long tail)
+        exp:0.8              exponential with that mean
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] if args else []
+    kind = kind.strip().lower()
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda: random.lognormvariate(mu, values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda: random.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"bad latency spec: {spec!r}")
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty one)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-p * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
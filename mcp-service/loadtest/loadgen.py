@@ -0,0 +1,161 @@
+"""
+Load generator for the MCP service.
+
+Keeps `--concurrency` requests in flight against a weighted mix of
+endpoints for `--duration` seconds (or `--requests` total) and reports
+throughput, errors and p50/p95/p99 latency per endpoint.
+
+    python -m loadtest.loadgen --url http://localhost:8100 --concurrency 32 --duration 60 \\
+        --mix adapt=5,adapt-stream=1,translate=2,cultural-adapt=2 --variants 200
+
+`--variants` is the number of distinct lessons drawn from; lower values
+mean more adaptation-cache and translation-memory hits.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from loadtest.latency import percentile
+
+LANGUAGES = ["hi", "pa", "ta", "te", "mr", "bn", "gu", "kn", "ml", "or", "ur"]
+REGIONS = ["Punjab", "Tamil Nadu", "Kerala", "Maharashtra", "West Bengal", "Gujarat", "Karnataka"]
+SUBJECTS = ["math", "science", "history", "english"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def lesson(variant: int) -> str:
+    return (f"<h2>Lesson {variant}</h2>\n<p>A farmer has {variant % 17 + 3} baskets with "
+            f"{variant % 9 + 2} mangoes each. How many mangoes are there in total?</p>\n"
+            f"<p>Explain how multiplication helps answer this quickly.</p>")
+
+
+def context(rng: random.Random) -> dict:
+    return {
+        "user": {"grade": rng.randint(1, 12), "preferred_language": rng.choice(LANGUAGES), "region": rng.choice(REGIONS)},
+        "device": {"is_mobile": rng.random() < 0.6},
+        "content": {"subject": rng.choice(SUBJECTS), "difficulty": rng.choice(DIFFICULTIES)},
+    }
+
+
+def build_request(name: str, rng: random.Random, variants: int):
+    """Return (method, path, json body, is_stream) for one request of the named endpoint."""
+    text = lesson(rng.randrange(variants))
+    if name == "adapt":
+        return "POST", "/adapt", {"lesson_content": text, "context": context(rng)}, False
+    if name == "adapt-stream":
+        return "POST", "/adapt/stream", {"lesson_content": text, "context": context(rng)}, True
+    if name == "cultural-adapt":
+        return "POST", "/cultural-adapt", {"lesson_content": text, "context": context(rng)}, False
+    if name == "translate":
+        return "POST", "/translate", {"text": text, "target_language": rng.choice(LANGUAGES)}, False
+    if name == "translate-multi":
+        return "POST", "/translate/multi", {"text": text, "target_languages": rng.sample(LANGUAGES, 4)}, False
+    raise ValueError(f"unknown endpoint: {name}")
+
+
+ENDPOINTS = ["adapt", "adapt-stream", "cultural-adapt", "translate", "translate-multi"]
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        if part.strip():
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name not in ENDPOINTS:
+                raise SystemExit(f"unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+            mix[name] = float(weight or 1)
+    return mix
+
+
+async def run(url: str, mix: dict, concurrency: int, duration: float, total: int, variants: int,
+              timeout: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    issued = 0
+    started = time.perf_counter()
+    stop_at = started + duration if duration else None
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal issued
+        while True:
+            if total and issued >= total:
+                return
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                return
+            issued += 1
+            name = rng.choices(names, weights)[0]
+            method, path, body, stream = build_request(name, rng, variants)
+            t0 = time.perf_counter()
+            try:
+                if stream:
+                    async with client.stream(method, url + path, json=body) as r:
+                        async for _ in r.aiter_bytes():
+                            pass
+                else:
+                    r = await client.request(method, url + path, json=body)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = (time.perf_counter() - t0) * 1000
+            if ok:
+                samples[name].append(elapsed)
+            else:
+                errors[name] += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    report = {"wall_s": round(wall, 2), "concurrency": concurrency, "endpoints": {}}
+    for name in names + ["all"]:
+        lat = sorted(samples[name]) if name != "all" else sorted(x for v in samples.values() for x in v)
+        err = errors[name] if name != "all" else sum(errors.values())
+        report["endpoints"][name] = {
+            "requests": len(lat) + err,
+            "errors": err,
+            "rps": round(len(lat) / wall, 2) if wall else 0.0,
+            "p50_ms": round(percentile(lat, 50), 1),
+            "p95_ms": round(percentile(lat, 95), 1),
+            "p99_ms": round(percentile(lat, 99), 1),
+            "max_ms": round(lat[-1], 1) if lat else 0.0,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8100")
+    parser.add_argument("--mix", default="adapt=5,cultural-adapt=3,translate=2")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="seconds (0 = use --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many requests")
+    parser.add_argument("--variants", type=int, default=100, help="distinct lessons to draw from")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    if not args.duration and not args.requests:
+        raise SystemExit("set --duration or --requests")
+
+    report = asyncio.run(run(args.url.rstrip("/"), parse_mix(args.mix), args.concurrency, args.duration,
+                             args.requests, args.variants, args.timeout, args.seed))
+    if args.json:
+        print(json.dumps(report))
+        return
+    print(f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, r in report["endpoints"].items():
+        print(f"{name:<16}{r['requests']:>10}{r['errors']:>8}{r['rps']:>9.2f}{r['p50_ms']:>10.1f}"
+              f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}")
+    print(f"wall {report['wall_s']}s at concurrency {report['concurrency']}")
+
+
+if __name__ == "__main__":
+    main()
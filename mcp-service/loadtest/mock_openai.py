@@ -0,0 +1,151 @@
+"""
+OpenAI-compatible stand-in for load tests.
+
+Serves POST /v1/chat/completions (plain and stream=true) with sampled
+latency, optional 429/5xx injection, an upstream-style RPM/TPM quota and
+usage accounting, so the MCP service's limiter, retries and fallbacks see
+realistic behaviour without network access or an API key.
+
+    python -m loadtest.mock_openai --port 9100 --latency lognormal:0.8,0.5 --rate-429 0.02
+    OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:9100/v1 python app.py
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from loadtest.latency import parse_latency
+
+
+def count_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class Quota:
+    """Fixed one-minute window of requests and tokens, like a provider account limit."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = 0
+        self.requests = 0
+        self.tokens = 0
+
+    def admit(self, tokens: int):
+        """Return None if admitted, else seconds until the window resets."""
+        now = time.time()
+        window = int(now // 60)
+        if window != self.window:
+            self.window, self.requests, self.tokens = window, 0, 0
+        if (self.rpm and self.requests + 1 > self.rpm) or (self.tpm and self.tokens + tokens > self.tpm):
+            return 60 - now % 60
+        self.requests += 1
+        self.tokens += tokens
+        return None
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="mock-openai")
+    latency = parse_latency(args.latency)
+    quota = Quota(args.rpm, args.tpm)
+    stats = {"requests": 0, "streams": 0, "injected_429": 0, "quota_429": 0, "injected_5xx": 0,
+             "prompt_tokens": 0, "completion_tokens": 0}
+
+    def completion_text(prompt: str) -> str:
+        body = prompt.rsplit("\n\n", 1)[-1].strip() or prompt.strip()
+        return ("[mock] " + body)[: args.completion_tokens * 4]
+
+    def rate_limited(retry_after: float) -> JSONResponse:
+        return JSONResponse({"error": {"message": "Rate limit reached", "type": "requests"}}, status_code=429,
+                            headers={"retry-after": f"{retry_after:.2f}", "retry-after-ms": str(int(retry_after * 1000))})
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        stats["requests"] += 1
+        prompt = "\n".join(m.get("content", "") for m in payload.get("messages", []))
+        prompt_tokens = count_tokens(prompt)
+        text = completion_text(payload.get("messages", [{}])[-1].get("content", ""))
+        completion_tokens = count_tokens(text)
+
+        if random.random() < args.rate_429:
+            stats["injected_429"] += 1
+            return rate_limited(args.retry_after)
+        wait = quota.admit(prompt_tokens + completion_tokens)
+        if wait is not None:
+            stats["quota_429"] += 1
+            return rate_limited(wait)
+        if random.random() < args.error_rate:
+            stats["injected_5xx"] += 1
+            await asyncio.sleep(latency())
+            return JSONResponse({"error": {"message": "injected failure"}}, status_code=503)
+
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        model = payload.get("model", "mock")
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        if not payload.get("stream"):
+            await asyncio.sleep(latency())
+            return {
+                "id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        stats["streams"] += 1
+
+        async def events():
+            await asyncio.sleep(latency())  # time to first token
+            step = 1.0 / args.tokens_per_second if args.tokens_per_second > 0 else 0.0
+            for i in range(0, len(text), 4):
+                chunk = {"id": cid, "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": text[i:i + 4]}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if step:
+                    await asyncio.sleep(step)
+            done = {"id": cid, "object": "chat.completion.chunk", "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    @app.get("/health")
+    def health():
+        return {"ok": True, "service": "mock-openai"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default="lognormal:0.8,0.5", help="see loadtest.latency.parse_latency")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="streaming speed after the first token")
+    parser.add_argument("--completion-tokens", type=int, default=200, help="max completion length")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rpm", type=int, default=0, help="account requests/minute quota (0 = none)")
+    parser.add_argument("--tpm", type=int, default=0, help="account tokens/minute quota (0 = none)")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Optional
+
+
+class Policy:
+    """
+    A postprocess policy. `applies(ctx)` decides whether it runs for a
+    context. A running policy may contribute a fixed `prefix` placed before
+    the text and/or a `line` transform called once per output line (return
+    None to drop the line). What a policy does must depend only on whether it
+    applies, so chains can be cached per applicability pattern.
+    """
+
+    name = ""
+    prefix = ""
+    line = None  # optional: def line(self, text: str) -> Optional[str]
+
+    def applies(self, ctx) -> bool:
+        return True
+
+
+class PolicyChain:
+    """The applicable policies for one kind of context, run in a single pass over the lines."""
+
+    def __init__(self, policies: tuple):
+        self.policies = policies
+        self.prefix = "".join(p.prefix for p in policies)
+        self.line_fns = tuple(p.line for p in policies if p.line is not None)
+
+    def _line(self, text: str) -> Optional[str]:
+        for fn in self.line_fns:
+            text = fn(text)
+            if text is None:
+                return None
+        return text
+
+    def apply(self, text: str) -> str:
+        text = self.prefix + text
+        if not self.line_fns:
+            return text
+        out = []
+        for line in text.split("\n"):
+            line = self._line(line)
+            if line is not None:
+                out.append(line)
+        return "\n".join(out)
+
+    def stream(self) -> "ChainStream":
+        return ChainStream(self)
+
+
+class ChainStream:
+    """
+    Incremental form of PolicyChain.apply(): feed() chunks as they arrive and
+    the concatenated output equals apply() on the whole text. Without line
+    policies chunks pass straight through; otherwise each line goes out as
+    soon as it is complete.
+    """
+
+    def __init__(self, chain: PolicyChain):
+        self._chain = chain
+        self._prefix = chain.prefix
+        self._buffer = ""
+        self._emitted = False
+
+    def _emit(self, lines: list) -> str:
+        out = []
+        for line in lines:
+            line = self._chain._line(line)
+            if line is not None:
+                out.append("\n" + line if self._emitted else line)
+                self._emitted = True
+        return "".join(out)
+
+    def feed(self, chunk: str) -> str:
+        if self._prefix:
+            chunk, self._prefix = self._prefix + chunk, ""
+        if not self._chain.line_fns:
+            return chunk
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return ""
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._emit(lines)
+
+    def close(self) -> str:
+        tail = self.feed("") if self._prefix else ""
+        if not self._chain.line_fns:
+            return tail
+        rest, self._buffer = self._buffer, ""
+        return tail + self._emit([rest])
+
+
+class PolicyRegistry:
+    """Ordered set of policies; the chain for a context is cached by which policies apply."""
+
+    def __init__(self, policies=()):
+        self.policies = list(policies)
+        self._chain = lru_cache(maxsize=64)(self._build)
+
+    def register(self, policy: Policy) -> Policy:
+        self.policies.append(policy)
+        self._chain.cache_clear()
+        return policy
+
+    def _build(self, pattern: tuple) -> PolicyChain:
+        return PolicyChain(tuple(p for p, on in zip(self.policies, pattern) if on))
+
+    def chain_for(self, ctx) -> PolicyChain:
+        return self._chain(tuple(p.applies(ctx) for p in self.policies))
@@ -0,0 +1,12 @@
+from policies.base import PolicyRegistry
+from policies import short_on_mobile, tone_reading_level
+
+# Application order: the reading-level prefix becomes part of the first line
+# before mobile bulleting sees it.
+registry = PolicyRegistry([
+    tone_reading_level.policy,
+    short_on_mobile.policy,
+])
+
+register = registry.register
+chain_for = registry.chain_for
@@ -1,7 +1,25 @@
-from ..schemas.context import Context
-def apply(ctx: Context, draft: str) -> str:
-    if ctx.device.is_mobile:
-        lines = [l.strip() for l in draft.split("\n") if l.strip()]
-        out = [("• " + l[:120] + "…") if len(l) > 120 else ("• " + l) for l in lines]
-        return "\n".join(out)
-    return draft
+from typing import Optional
+
+from schemas.context import Context
+from policies.base import Policy
+
+MAX_LINE = 120
+
+def bullet(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line:
+        return None
+    return ("• " + line[:MAX_LINE] + "…") if len(line) > MAX_LINE else ("• " + line)
+
+class ShortOnMobile(Policy):
+    """Bullet every non-blank line and cut it to MAX_LINE characters on mobile."""
+
+    name = "short_on_mobile"
+
+    def applies(self, ctx: Context) -> bool:
+        return ctx.device.is_mobile
+
+    def line(self, text: str) -> Optional[str]:
+        return bullet(text)
+
+policy = ShortOnMobile()
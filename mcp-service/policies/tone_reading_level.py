@@ -1,5 +1,15 @@
-from ..schemas.context import Context
-def apply(ctx: Context, draft: str) -> str:
-    if ctx.user.grade <= 5:
-        return "Use simple words. " + draft
-    return draft
+from schemas.context import Context
+from policies.base import Policy
+
+SIMPLE_WORDS = "Use simple words. "
+
+class ToneReadingLevel(Policy):
+    """Ask younger readers' output to keep to simple words."""
+
+    name = "tone_reading_level"
+    prefix = SIMPLE_WORDS
+
+    def applies(self, ctx: Context) -> bool:
+        return ctx.user.grade <= 5
+
+policy = ToneReadingLevel()
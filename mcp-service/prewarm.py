@@ -0,0 +1,181 @@
+"""
+Offline pre-adaptation: warm the /adapt cache for a lesson catalog.
+
+Every lesson is run through the same collector -> transformer -> build_prompt
+-> chat_adapt -> postprocess pipeline as /adapt for each cohort in the
+matrix (locale x grade x device), and LLM results are written to the
+adaptation store so the first live student of a cohort gets a cache hit.
+
+    ADAPT_CACHE_DB=/var/data/adapt.db python prewarm.py catalog.ndjson \\
+        --locales "pa:Punjab,ta:Tamil Nadu" --grades 1-5,6-8 --devices mobile,desktop \\
+        --concurrency 4 --rpm 120 --max-llm-calls 5000 --checkpoint prewarm.done --ttl 604800
+
+The catalog is a JSON array or NDJSON of {"lesson_content", "subject",
+"difficulty"} objects. Run with the same OPENAI_MODEL as the live service;
+the model is part of the cache key. Cohorts whose entry is still in the store
+are skipped, so an interrupted run resumes where it stopped. Completed keys
+are appended to the checkpoint file; a checkpointed key whose entry has
+since expired is warmed again and counted as "expired". --ttl sets how long
+warmed entries live (default ADAPT_CACHE_TTL).
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from schemas.adapt import AdaptRequest
+from schemas.context import Context, UserCtx, DeviceCtx, ContentCtx
+from clients.http_pool import start_pool, close_pool
+from services.adaptation import normalize_context, run_adaptation
+from services.adaptation_cache import adapt_cache
+from configs.settings import ADAPT_CACHE_DB, ADAPT_CACHE_TTL
+
+
+class RateBudget:
+    """Paces LLM calls to `rpm` per minute and refuses more than `max_calls` in total."""
+
+    def __init__(self, rpm: float = 0, max_calls: int = 0):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.max_calls = max_calls
+        self.calls = 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> bool:
+        async with self._lock:
+            if self.max_calls and self.calls >= self.max_calls:
+                return False
+            self.calls += 1
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(self._next, now) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+def load_catalog(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def parse_grades(spec: str) -> list:
+    """'1-5,8' -> [1, 2, 3, 4, 5, 8]. The cache key holds the exact grade, so bands are expanded."""
+    grades = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            grades.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            grades.append(int(part))
+    return sorted(set(grades))
+
+
+def parse_locales(spec: str) -> list:
+    """'pa:Punjab,ta:Tamil Nadu' -> [("pa", "Punjab"), ("ta", "Tamil Nadu")]."""
+    locales = []
+    for part in spec.split(","):
+        if part.strip():
+            language, _, region = part.partition(":")
+            locales.append((language.strip(), region.strip() or UserCtx().region))
+    return locales
+
+
+def cohort_requests(catalog: list, locales: list, grades: list, devices: list):
+    for lesson in catalog:
+        for language, region in locales:
+            for grade in grades:
+                for device in devices:
+                    yield AdaptRequest(
+                        lesson_content=lesson["lesson_content"],
+                        context=Context(
+                            user=UserCtx(grade=grade, preferred_language=language, region=region),
+                            device=DeviceCtx(is_mobile=device == "mobile"),
+                            content=ContentCtx(
+                                subject=lesson.get("subject", ContentCtx().subject),
+                                difficulty=lesson.get("difficulty", ContentCtx().difficulty),
+                            ),
+                        ),
+                    )
+
+
+async def prewarm(requests, concurrency: int, budget: RateBudget, checkpoint: str = "",
+                  ttl: float = None) -> dict:
+    done = set()
+    if checkpoint:
+        try:
+            with open(checkpoint, encoding="utf-8") as f:
+                done = {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            pass
+    stats = {"warmed": 0, "skipped": 0, "expired": 0, "fallback": 0, "budget_exhausted": False}
+    seen = set()
+    out = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+    requests = iter(requests)
+
+    async def worker():
+        for req in requests:
+            if stats["budget_exhausted"]:
+                return
+            ctx, key = normalize_context(req)
+            if key in seen or adapt_cache.get(key) is not None:
+                stats["skipped"] += 1
+                continue
+            seen.add(key)  # keeps cohorts that normalize to the same key from running twice
+            if key in done:
+                stats["expired"] += 1
+            if not await budget.acquire():
+                stats["budget_exhausted"] = True
+                return
+            _, from_llm, _ = await run_adaptation(ctx, req.lesson_content, key, cache_ttl=ttl)
+            if not from_llm:
+                stats["fallback"] += 1
+                continue
+            stats["warmed"] += 1
+            if out is not None:
+                out.write(key + "\n")
+                out.flush()
+
+    await start_pool()
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        await close_pool()
+        if out is not None:
+            out.close()
+    stats["llm_calls"] = budget.calls
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("catalog", help="JSON array or NDJSON of lessons")
+    parser.add_argument("--locales", required=True, help="comma-separated language:region pairs")
+    parser.add_argument("--grades", default="1-12", help="grades or grade bands, e.g. 1-5,6-8")
+    parser.add_argument("--devices", default="mobile,desktop")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rpm", type=float, default=60, help="LLM calls per minute (0 = unpaced)")
+    parser.add_argument("--max-llm-calls", type=int, default=0, help="stop after this many LLM calls (0 = no limit)")
+    parser.add_argument("--checkpoint", default="", help="file of completed cache keys")
+    parser.add_argument("--ttl", type=float, default=ADAPT_CACHE_TTL, help="seconds warmed entries stay cached")
+    args = parser.parse_args()
+
+    if not ADAPT_CACHE_DB:
+        sys.exit("ADAPT_CACHE_DB is not set; warmed entries would only live in this process")
+    devices = [d.strip() for d in args.devices.split(",") if d.strip()]
+    if any(d not in ("mobile", "desktop") for d in devices):
+        sys.exit("--devices takes mobile and/or desktop")
+
+    requests = cohort_requests(load_catalog(args.catalog), parse_locales(args.locales), parse_grades(args.grades), devices)
+    stats = asyncio.run(prewarm(requests, args.concurrency, RateBudget(args.rpm, args.max_llm_calls),
+                                args.checkpoint, args.ttl))
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
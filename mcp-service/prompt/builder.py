@@ -1,17 +1,16 @@
-from ..schemas.context import Context
-from ..policies import short_on_mobile, regional_examples, tone_reading_level
+from schemas.context import Context
+from policies.registry import chain_for
+from transformers.cultural_adapter import regional_examples
 
 def build_prompt(ctx: Context, lesson_content: str, personalization: dict) -> str:
     hints = f"Personalization score: {personalization.get('score',0.5):.2f} ({personalization.get('label','neutral')}). Subject: {ctx.content.subject}. Difficulty: {ctx.content.difficulty}."
+    local = regional_examples(ctx)
     return (
         f"Translate and culturally adapt for grade {ctx.user.grade} in {ctx.user.region}. "
-        f"Target language: {ctx.user.preferred_language}. Be concise and age-appropriate. {hints}\n\n"
-        f"Lesson:\n{lesson_content}"
+        f"Target language: {ctx.user.preferred_language}. Be concise and age-appropriate. {hints}\n"
+        + (f"{local}\n" if local else "")
+        + f"\nLesson:\n{lesson_content}"
     )
 
 def postprocess(ctx: Context, adapted_text: str) -> str:
-    text = adapted_text
-    text = tone_reading_level.apply(ctx, text)
-    text = regional_examples.apply(ctx, text)
-    text = short_on_mobile.apply(ctx, text)
-    return text
+    return chain_for(ctx).apply(adapted_text)
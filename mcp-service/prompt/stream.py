@@ -0,0 +1,18 @@
+from schemas.context import Context
+from policies.registry import chain_for
+
+class StreamPostprocessor:
+    """
+    Applies the postprocess policy chain to text as it streams in: any
+    prefix goes out with the first chunk and line policies (mobile
+    bulleting) run on each line as soon as it is complete.
+    """
+
+    def __init__(self, ctx: Context):
+        self._stream = chain_for(ctx).stream()
+
+    def feed(self, chunk: str) -> str:
+        return self._stream.feed(chunk)
+
+    def close(self) -> str:
+        return self._stream.close()
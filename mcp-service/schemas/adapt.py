@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List
 from .context import Context
 
 class AdaptRequest(BaseModel):
@@ -13,3 +14,19 @@ class AdaptResponse(BaseModel):
     language: str
     region: str
     grade: int
+
+class BulkCulturalAdaptRequest(BaseModel):
+    context: Context
+    count: int = 10
+    lesson_content: str = ""  # only used to seed selection
+
+class BulkCulturalAdaptResponse(BaseModel):
+    items: List[str]
+    requested: int
+    subject: str
+    adaptation_level: str
+    personalization_score: float | None = None
+    personalization_label: str | None = None
+    language: str
+    region: str
+    grade: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from .context import Context
 
 class TranslateRequest(BaseModel):
@@ -8,10 +8,27 @@ class TranslateRequest(BaseModel):
     source_language: Optional[str] = None
     context: Optional[Context] = None
     preserve_formatting: bool = True
+    segmented: Optional[bool] = None  # None: segment automatically when the text is long
 
 class TranslateResponse(BaseModel):
     translated_text: str
     source_language: str
     target_language: str
     quality_score: Optional[float] = None
-    context_preserved: bool = True
\ No newline at end of file
+    context_preserved: bool = True
+    segments: Optional[int] = None  # non-blank blocks, the unit of translation memory
+    tm_exact_hits: int = 0
+    tm_fuzzy_hits: int = 0
+    tm_hit_rate: Optional[float] = None
+
+class MultiTranslateRequest(BaseModel):
+    text: str
+    target_languages: List[str]
+    source_language: Optional[str] = None
+    context: Optional[Context] = None
+    preserve_formatting: bool = True
+    segmented: Optional[bool] = None
+
+class MultiTranslateResponse(BaseModel):
+    source_language: str
+    results: Dict[str, TranslateResponse]  # target language -> translation, in request order
@@ -0,0 +1,95 @@
+import asyncio
+from schemas.adapt import AdaptRequest
+from utils.logger import get_logger
+from utils.metrics import FALLBACKS, observe_stage, timed
+from utils.pipeline import Pipeline, Stage
+from collectors.user_collector import collect_user
+from collectors.device_collector import collect_device
+from collectors.content_collector import collect_content
+from transformers.locale_deriver import derive_locale
+from transformers.difficulty_smoother import smooth_difficulty
+from transformers.personalization_bridge import attach_personalization
+from transformers.cultural_adapter import apply_cultural_adaptation
+from prompt.builder import build_prompt, postprocess
+from clients.openai_client import chat_adapt
+from services.adaptation_cache import adapt_cache, adapt_cache_key
+from configs.settings import ADAPT_BUDGET, ADAPT_ML_DEADLINE
+
+log = get_logger("adaptation")
+
+DEFAULT_PERSONALIZATION = {"score": 0.5, "label": "neutral"}
+
+def normalize_context(req: AdaptRequest):
+    """Run collectors and cheap transformers; returns (ctx, adapt cache key)."""
+    ctx = req.context
+    with timed("collectors"):
+        ctx.user = collect_user(ctx.user)
+        ctx.device = collect_device(ctx.device)
+        ctx.content = collect_content(ctx.content)
+
+    with timed("derive_locale"):
+        ctx = derive_locale(ctx)
+    with timed("smooth_difficulty"):
+        ctx = smooth_difficulty(ctx)
+    return ctx, adapt_cache_key(ctx, req.lesson_content)
+
+def fallback_text(ctx, lesson_content: str) -> str:
+    return f"[Fallback] {ctx.user.preferred_language}/{ctx.user.region}/g{ctx.user.grade}\n{lesson_content}"
+
+async def _llm(prompt: str) -> str:
+    """chat_adapt for the pipeline: upstream errors become "" so the lesson falls back."""
+    try:
+        return await chat_adapt(prompt)
+    except asyncio.TimeoutError:
+        raise
+    except Exception as e:
+        log.error(f"LLM adapt failed: {str(e)}")
+        return ""
+
+# /adapt after the cache check. Cultural prep and the ML score fetch run
+# concurrently; if ml-service misses ADAPT_ML_DEADLINE the prompt is built
+# with the default score, and an LLM call that outlives the request budget
+# falls back to the unadapted lesson.
+adapt_pipeline = Pipeline([
+    Stage("culture", lambda r: apply_cultural_adaptation(r["ctx"])),
+    Stage("personalization", lambda r: attach_personalization(r["ctx"]),
+          timeout=ADAPT_ML_DEADLINE, default=DEFAULT_PERSONALIZATION),
+    Stage("prompt", lambda r: build_prompt(r["culture"], r["lesson_content"], r["personalization"]),
+          deps=("culture", "personalization")),
+    Stage("llm", lambda r: _llm(r["prompt"]), deps=("prompt",), default=""),
+    Stage("postprocess", lambda r: postprocess(r["culture"], r["llm"] or fallback_text(r["culture"], r["lesson_content"])),
+          deps=("llm",)),
+])
+
+async def run_adaptation(ctx, lesson_content: str, cache_key: str, budget: float = ADAPT_BUDGET,
+                         cache_ttl: float = None):
+    """
+    Run the pipeline for an already normalized context and store the result
+    under cache_key (for cache_ttl seconds, default ADAPT_CACHE_TTL);
+    returns (result dict, from_llm, PipelineResult).
+    Fallback text is never cached so the next request retries the LLM.
+    """
+    run = await adapt_pipeline.run({"ctx": ctx, "lesson_content": lesson_content}, budget=budget)
+    for name, started in run.starts.items():
+        observe_stage(name, run.timings[name] / 1000, started)
+    if run.timed_out:
+        log.warning(f"adapt stages past deadline: {', '.join(run.timed_out)}")
+        for name in run.timed_out:
+            FALLBACKS.labels(f"{name}_deadline").inc()
+    ctx = run.results["culture"]
+    personalization = run.results["personalization"]
+    from_llm = bool(run.results["llm"])
+
+    result = dict(
+        adapted_text=run.results["postprocess"],
+        personalization_score=personalization.get("score"),
+        personalization_label=personalization.get("label"),
+        language=ctx.user.preferred_language,
+        region=ctx.user.region,
+        grade=ctx.user.grade
+    )
+    if from_llm:
+        adapt_cache.set(cache_key, result, cache_ttl)
+    else:
+        FALLBACKS.labels("adapt_llm").inc()
+    return result, from_llm, run
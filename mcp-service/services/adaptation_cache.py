@@ -0,0 +1,30 @@
+import hashlib
+import json
+from schemas.context import Context
+from utils.cache import TieredCache
+from configs.settings import ADAPT_CACHE_SIZE, ADAPT_CACHE_TTL, ADAPT_CACHE_DB, OPENAI_MODEL
+
+# Bump when build_prompt/postprocess change in a way that invalidates stored output.
+PROMPT_VERSION = "2"
+
+adapt_cache = TieredCache(ADAPT_CACHE_SIZE, ADAPT_CACHE_TTL, ADAPT_CACHE_DB, table="adapt_cache")
+
+def adapt_cache_key(ctx: Context, lesson_content: str) -> str:
+    """
+    Hash of the lesson plus only the context fields that reach build_prompt and
+    postprocess, so students in the same cohort share one entry.
+    """
+    fields = [
+        PROMPT_VERSION,
+        OPENAI_MODEL,
+        ctx.user.preferred_language,
+        ctx.user.region,
+        ctx.user.grade,
+        ctx.content.subject,
+        ctx.content.difficulty,
+        ctx.device.is_mobile,
+        ctx.content.adaptation_level,
+        ctx.user.local_examples,
+        hashlib.sha256(lesson_content.encode("utf-8")).hexdigest(),
+    ]
+    return hashlib.sha256(json.dumps(fields).encode("utf-8")).hexdigest()
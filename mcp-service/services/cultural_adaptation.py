@@ -1,9 +1,11 @@
-from schemas.adapt import AdaptRequest, AdaptResponse
+from schemas.adapt import AdaptRequest, AdaptResponse, BulkCulturalAdaptRequest, BulkCulturalAdaptResponse
 from schemas.context import Context
 from transformers.cultural_adapter import apply_cultural_adaptation, CULTURAL_CONTEXTS, DEFAULT_CONTEXT
+from services.template_engine import TemplateEngine, sample_distinct, stable_seed
 from utils.logger import get_logger
 import json
 import random
+from functools import lru_cache
 
 log = get_logger("cultural_adaptation_service")
 
@@ -91,69 +93,91 @@ SUBJECT_TEMPLATES = {
 }
 
 
-def get_cultural_variables(region: str, subject: str):
-    """Get cultural variables for a specific region and subject"""
+@lru_cache(maxsize=256)
+def get_variable_pools(region: str, subject: str) -> dict:
+    """
+    Candidate values for every cultural variable of a region and subject.
+    Cached, so the region's cultural data is only assembled once.
+    """
     cultural_data = CULTURAL_CONTEXTS.get(region, DEFAULT_CONTEXT)
     
     # Common variables for all subjects
-    variables = {
-        "region": region,
-        "language": cultural_data["language"],
-        "person": random.choice(["Raj", "Priya", "Amit", "Sunita", "Vikram", "Meera"]),
-        "landmark": random.choice(cultural_data["landmarks"]),
-        "festival": random.choice(cultural_data["festivals"]),
-        "local_item": random.choice(cultural_data["examples"]),
-        "local_dish": random.choice(cultural_data["food"]),
-        "currency": "rupees" if region in CULTURAL_CONTEXTS else "dollars",
+    pools = {
+        "region": [region],
+        "language": [cultural_data["language"]],
+        "person": ["Raj", "Priya", "Amit", "Sunita", "Vikram", "Meera"],
+        "landmark": cultural_data["landmarks"],
+        "festival": cultural_data["festivals"],
+        "local_item": cultural_data["examples"],
+        "local_dish": cultural_data["food"],
+        "currency": ["rupees" if region in CULTURAL_CONTEXTS else "dollars"],
     }
     
     # Subject-specific variables
     if subject.lower() == "math":
-        variables.update({
-            "price": random.randint(10, 100),
-            "quantity": random.randint(2, 20),
-            "amount": random.randint(1, 10),
-            "distance": random.randint(50, 500),
-            "speed": random.randint(30, 100),
-            "city1": f"{region} City",
-            "city2": "Delhi" if region != "Delhi" else "Mumbai",
-            "local_sweet": random.choice(cultural_data["food"]),
-            "ingredient": random.choice(["rice", "flour", "sugar", "milk"]),
+        pools.update({
+            "price": range(10, 101),
+            "quantity": range(2, 21),
+            "amount": range(1, 11),
+            "distance": range(50, 501),
+            "speed": range(30, 101),
+            "city1": [f"{region} City"],
+            "city2": ["Delhi" if region != "Delhi" else "Mumbai"],
+            "local_sweet": cultural_data["food"],
+            "ingredient": ["rice", "flour", "sugar", "milk"],
         })
     elif subject.lower() == "science":
-        variables.update({
-            "season": random.choice(["summer", "monsoon", "winter", "spring"]),
-            "local_crop": random.choice(["rice", "wheat", "cotton", "sugarcane", "tea"]),
-            "natural_factor": random.choice(["rain", "wind", "river flow", "human activity"]),
-            "craft": random.choice(["pottery", "weaving", "metalwork", "carpentry"]),
-            "scientific_concept": random.choice(["friction", "heat transfer", "chemical reactions", "simple machines"]),
-            "local_plant": random.choice(["neem", "tulsi", "banyan", "peepal"]),
-            "local_tool": random.choice(["plough", "water wheel", "grinding stone", "loom"]),
-            "activity": random.choice(["farming", "cooking", "building", "crafting"]),
+        pools.update({
+            "season": ["summer", "monsoon", "winter", "spring"],
+            "local_crop": ["rice", "wheat", "cotton", "sugarcane", "tea"],
+            "natural_factor": ["rain", "wind", "river flow", "human activity"],
+            "craft": ["pottery", "weaving", "metalwork", "carpentry"],
+            "scientific_concept": ["friction", "heat transfer", "chemical reactions", "simple machines"],
+            "local_plant": ["neem", "tulsi", "banyan", "peepal"],
+            "local_tool": ["plough", "water wheel", "grinding stone", "loom"],
+            "activity": ["farming", "cooking", "building", "crafting"],
         })
     elif subject.lower() == "history":
-        variables.update({
-            "historical_event": random.choice(["Independence Movement", "Mughal Empire", "British Colonization", "Ancient Trade Routes"]),
-            "historical_figure": random.choice(["Mahatma Gandhi", "Rani Lakshmibai", "Emperor Ashoka", "Akbar"]),
-            "achievement": random.choice(["non-violent resistance", "military leadership", "unification", "cultural reforms"]),
-            "historical_period": random.choice(["Medieval Period", "Colonial Era", "Ancient Civilization", "Post-Independence"]),
-            "local_tradition": random.choice(["folk dance", "storytelling", "handicrafts", "religious practices"]),
+        pools.update({
+            "historical_event": ["Independence Movement", "Mughal Empire", "British Colonization", "Ancient Trade Routes"],
+            "historical_figure": ["Mahatma Gandhi", "Rani Lakshmibai", "Emperor Ashoka", "Akbar"],
+            "achievement": ["non-violent resistance", "military leadership", "unification", "cultural reforms"],
+            "historical_period": ["Medieval Period", "Colonial Era", "Ancient Civilization", "Post-Independence"],
+            "local_tradition": ["folk dance", "storytelling", "handicrafts", "religious practices"],
         })
     elif subject.lower() == "language":
-        variables.update({
-            "local_language": cultural_data["language"],
-            "local_phrase": "Namaste" if cultural_data["language"] == "Hindi" else "Greetings",
-            "translation": "Hello and respect to you",
-            "local_literature": f"Tales of {region}",
-            "local_author": f"Famous Author from {region}",
-            "local_tradition": random.choice(["storytelling", "poetry recitation", "folk songs"]),
-            "common_word": "friend",
-            "local_word": "dost" if cultural_data["language"] == "Hindi" else "friend in local language",
-            "local_character": f"Folk Hero of {region}",
-            "local_greeting": "Namaste" if cultural_data["language"] == "Hindi" else "Local Greeting",
+        pools.update({
+            "local_language": [cultural_data["language"]],
+            "local_phrase": ["Namaste" if cultural_data["language"] == "Hindi" else "Greetings"],
+            "translation": ["Hello and respect to you"],
+            "local_literature": [f"Tales of {region}"],
+            "local_author": [f"Famous Author from {region}"],
+            "local_tradition": ["storytelling", "poetry recitation", "folk songs"],
+            "common_word": ["friend"],
+            "local_word": ["dost" if cultural_data["language"] == "Hindi" else "friend in local language"],
+            "local_character": [f"Folk Hero of {region}"],
+            "local_greeting": ["Namaste" if cultural_data["language"] == "Hindi" else "Local Greeting"],
         })
     
-    return variables
+    return {name: tuple(values) for name, values in pools.items()}
+
+
+def get_cultural_variables(region: str, subject: str, rng=random):
+    """
+    Get cultural variables for a specific region and subject.
+    Pass a seeded random.Random as `rng` for reproducible output.
+    """
+    return {name: rng.choice(values) for name, values in get_variable_pools(region, subject).items()}
+
+
+# Template families whose placeholders come from another subject's variables
+TEMPLATE_VARIABLES = {"general": "math"}
+
+def _template_variable_names(family: str):
+    return get_variable_pools("", TEMPLATE_VARIABLES.get(family, family)).keys()
+
+# Every template is parsed and checked against its variables once, at import
+template_engine = TemplateEngine(SUBJECT_TEMPLATES, _template_variable_names)
 
 
 def adapt_content(request: AdaptRequest) -> AdaptResponse:
@@ -183,20 +207,14 @@ def adapt_content(request: AdaptRequest) -> AdaptResponse:
     if subject not in SUBJECT_TEMPLATES:
         subject = "general"  # Default to general if subject not found
     
-    # Get templates for subject and adaptation level
-    templates = SUBJECT_TEMPLATES[subject][adaptation_level]
+    # Seed selection from user and lesson so the same request always renders
+    # the same text (and can be cached)
+    rng = random.Random(stable_seed(context.user.id or "", request.lesson_content, context.user.region, subject, adaptation_level))
     
-    # Get cultural variables
-    variables = get_cultural_variables(context.user.region, subject)
-    
-    # Select a random template and format it with variables
-    template = random.choice(templates)
-    try:
-        adapted_text = template.format(**variables)
-    except KeyError as e:
-        log.error(f"Missing variable in template: {e}")
-        # Fallback to original content
-        adapted_text = request.lesson_content
+    # Pick a precompiled template and fill it with cultural variables
+    template = template_engine.choose(subject, adaptation_level, rng)
+    variables = get_cultural_variables(context.user.region, TEMPLATE_VARIABLES.get(subject, subject), rng)
+    adapted_text = template.render(variables)
     
     # Calculate personalization score based on adaptation level
     personalization_scores = {"low": 0.3, "medium": 0.6, "high": 0.9}
@@ -213,4 +231,41 @@ def adapt_content(request: AdaptRequest) -> AdaptResponse:
         language=context.user.preferred_language,
         region=context.user.region,
         grade=context.user.grade
-    )
\ No newline at end of file
+    )
+
+# Upper bound on items per bulk request
+MAX_BULK_ITEMS = 1000
+
+def adapt_content_bulk(request: BulkCulturalAdaptRequest) -> BulkCulturalAdaptResponse:
+    """
+    Generate a worksheet of distinct culturally adapted items for one context.
+    Cultural data is resolved once and items are sampled without replacement
+    across every template and variable combination for the subject and level.
+    """
+    context = apply_cultural_adaptation(request.context)
+    
+    adaptation_level = context.content.adaptation_level.lower()
+    if adaptation_level not in ["low", "medium", "high"]:
+        adaptation_level = "medium"
+    
+    subject = context.content.subject.lower()
+    if subject not in SUBJECT_TEMPLATES:
+        subject = "general"
+    
+    count = max(0, min(request.count, MAX_BULK_ITEMS))
+    rng = random.Random(stable_seed(context.user.id or "", request.lesson_content, context.user.region, subject, adaptation_level, count))
+    pools = get_variable_pools(context.user.region, TEMPLATE_VARIABLES.get(subject, subject))
+    items = sample_distinct(template_engine.templates(subject, adaptation_level), pools, count, rng)
+    
+    personalization_scores = {"low": 0.3, "medium": 0.6, "high": 0.9}
+    return BulkCulturalAdaptResponse(
+        items=items,
+        requested=request.count,
+        subject=subject,
+        adaptation_level=adaptation_level,
+        personalization_score=personalization_scores.get(adaptation_level, 0.5),
+        personalization_label=f"{adaptation_level.capitalize()} cultural adaptation",
+        language=context.user.preferred_language,
+        region=context.user.region,
+        grade=context.user.grade
+    )
@@ -0,0 +1,96 @@
+import json
+import os
+from collections import deque
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: one pass over the text finds every pattern occurrence."""
+
+    def __init__(self, patterns: dict):
+        # patterns: lowercase pattern -> value reported when it matches
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), value))
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        """Values of patterns that occur in text starting at a word boundary."""
+        found, node = set(), 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                start = i - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.add(value)
+        return found
+
+
+class Glossary:
+    """
+    Educational terminology for every supported language, loaded from
+    <dir>/<lang>.json files mapping concept id -> term (or a list whose first
+    entry is the preferred term and the rest are extra forms to match).
+    Each language is compiled into one matcher so only the concepts that
+    actually occur in the source text are injected into the prompt.
+    """
+
+    def __init__(self, terms: dict):
+        self.terms = {}
+        self._matchers = {}
+        self._lines = {}
+        for lang, entries in terms.items():
+            preferred, patterns = {}, {}
+            for concept, forms in entries.items():
+                forms = [forms] if isinstance(forms, str) else list(forms)
+                preferred[concept] = forms[0]
+                for form in forms:
+                    patterns[form.casefold()] = concept
+            self.terms[lang] = preferred
+            self._matchers[lang] = AhoCorasick(patterns)
+        for lang, preferred in self.terms.items():
+            self._lines[lang] = {concept: f"{concept}: {term}" for concept, term in preferred.items()}
+
+    @classmethod
+    def load(cls, directory: str) -> "Glossary":
+        terms = {}
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".json"):
+                    with open(os.path.join(directory, name), encoding="utf-8") as f:
+                        terms[name[:-5]] = json.load(f)
+        return cls(terms)
+
+    def concepts_in(self, text: str, source_lang: str) -> set:
+        matcher = self._matchers.get(source_lang)
+        return matcher.find(text.casefold()) if matcher else set()
+
+    def prompt_lines(self, text: str, source_lang: str, target_lang: str) -> list:
+        """'concept: target term' lines for concepts present in text, in glossary order."""
+        lines = self._lines.get(target_lang)
+        if not lines:
+            return []
+        found = self.concepts_in(text, source_lang)
+        return [line for concept, line in lines.items() if concept in found]
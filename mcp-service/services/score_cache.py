@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+from utils.cache import TTLCache
+from utils.singleflight import SingleFlight
+
+DEFAULT_SCORE = {"score": 0.5, "label": "neutral"}
+_UNSEEN = object()
+_FAILED = object()
+
+
+class ScoreCache:
+    """
+    Stale-while-revalidate cache for ml-service scores keyed by
+    (grade, subject, difficulty).
+
+    Entries younger than `ttl` are served as is; up to `ttl + stale` they are
+    served while one background refresh runs; older entries are refetched
+    inline but still served if that fetch fails. Every upstream call goes
+    through `breaker`, so while ml-service is down requests get the cached or
+    default score without waiting on the timeout. The cache is dropped
+    whenever `fetch_version` reports a different live model version.
+
+    fetch_one(key) -> score dict, fetch_many(keys) -> list of score dicts and
+    fetch_version() -> version id are async and raise on failure.
+    """
+
+    def __init__(self, fetch_one, fetch_many, fetch_version, breaker, ttl: float = 300,
+                 stale: float = 3600, maxsize: int = 4096, version_check_interval: float = 30):
+        self.fetch_one = fetch_one
+        self.fetch_many = fetch_many
+        self.fetch_version = fetch_version
+        self.breaker = breaker
+        self.ttl = ttl
+        self.stale = stale
+        self.version_check_interval = version_check_interval
+        self._entries = TTLCache(maxsize, ttl=float("inf"))  # key -> (score, fetched_at)
+        self._flight = SingleFlight()
+        self._background = set()
+        self._version = _UNSEEN
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.defaults = 0
+        self.invalidations = 0
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _call(self, fn, *args):
+        """Run fn through the breaker; returns _FAILED when skipped or failed."""
+        if not self.breaker.allow():
+            return _FAILED
+        try:
+            value = await fn(*args)
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            return _FAILED
+        self.breaker.record_success()
+        return value
+
+    async def _refresh(self, key):
+        score = await self._call(self.fetch_one, key)
+        if score is _FAILED:
+            return None
+        self._entries.set(key, (score, time.monotonic()))
+        return score
+
+    async def _check_version(self):
+        version = await self._call(self.fetch_version)
+        if version is _FAILED:
+            return
+        if self._version is not _UNSEEN and version != self._version:
+            self.invalidate()
+        self._version = version
+
+    def _maybe_check_version(self):
+        now = time.monotonic()
+        if now - self._version_checked_at >= self.version_check_interval:
+            self._version_checked_at = now
+            self._spawn(self._flight.do("__version__", self._check_version))
+
+    def _lookup(self, key):
+        """Return (cached score or None, whether it needs refetching inline)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, True
+        score, fetched_at = entry
+        age = time.monotonic() - fetched_at
+        if age <= self.ttl:
+            self.hits += 1
+            return score, False
+        if age <= self.ttl + self.stale:
+            self.stale_hits += 1
+            self._spawn(self._flight.do(key, lambda: self._refresh(key)))
+            return score, False
+        return score, True
+
+    async def get(self, key) -> dict:
+        self._maybe_check_version()
+        cached, refetch = self._lookup(key)
+        if not refetch:
+            return dict(cached)
+        self.misses += 1
+        score = await self._flight.do(key, lambda: self._refresh(key))
+        if score is None:
+            score = cached
+        if score is None:
+            self.defaults += 1
+            return dict(DEFAULT_SCORE)
+        return dict(score)
+
+    async def get_many(self, keys: list) -> list:
+        """Scores for keys in order; all inline misses go upstream in one batch."""
+        self._maybe_check_version()
+        results, missing = [], {}
+        for i, key in enumerate(keys):
+            cached, refetch = self._lookup(key)
+            results.append(cached)
+            if refetch:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            self.misses += len(missing)
+            fetched = await self._call(self.fetch_many, list(missing))
+            if fetched is not _FAILED and len(fetched) == len(missing):
+                now = time.monotonic()
+                for key, score in zip(missing, fetched):
+                    self._entries.set(key, (score, now))
+                    for i in missing[key]:
+                        results[i] = score
+        out = []
+        for score in results:
+            if score is None:
+                self.defaults += 1
+                score = DEFAULT_SCORE
+            out.append(dict(score))
+        return out
+
+    def invalidate(self):
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses,
+            "defaults": self.defaults, "invalidations": self.invalidations,
+            "size": len(self._entries), "model_version": None if self._version is _UNSEEN else self._version,
+            "breaker": self.breaker.stats(),
+        }
@@ -0,0 +1,72 @@
+import re
+
+# Block-level elements whose closing tag is a safe place to cut a lesson.
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "aside", "blockquote",
+    "ul", "ol", "li", "table", "thead", "tbody", "tr", "pre",
+    "h1", "h2", "h3", "h4", "h5", "h6", "figure", "details",
+}
+VOID_BREAKS = {"br", "hr"}
+
+_TOKEN = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)\b[^>]*?(/?)>|\n[ \t]*\n")
+
+
+def split_blocks(text: str) -> list:
+    """
+    Cut text into the smallest pieces that end at a top-level block boundary:
+    after a closing block tag, a <br>/<hr>, or a blank line, but never inside
+    an open block element, so every piece keeps its tags balanced.
+    """
+    pieces, start, depth = [], 0, 0
+    for m in _TOKEN.finditer(text):
+        closing, name, self_closing = m.group(1), (m.group(2) or "").lower(), m.group(3)
+        boundary = False
+        if not name:
+            boundary = depth == 0
+        elif name in VOID_BREAKS:
+            boundary = depth == 0
+        elif name in BLOCK_TAGS and not self_closing:
+            if closing:
+                depth = max(0, depth - 1)
+                boundary = depth == 0
+            else:
+                depth += 1
+        if boundary:
+            pieces.append(text[start:m.end()])
+            start = m.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def pack_blocks(blocks: list, max_chars: float, breaks=frozenset()) -> list:
+    """
+    Group the indices of non-blank blocks into batches of roughly `max_chars`
+    for one LLM call each. Only adjacent blocks share a batch: a block whose
+    index is in `breaks` (e.g. a translation-memory hit) is left out and ends
+    the current batch. A single block larger than max_chars gets its own.
+    """
+    batches, current, size = [], [], 0
+    for i, block in enumerate(blocks):
+        if not block.strip():
+            continue
+        if i in breaks:
+            current = []
+            continue
+        if current and size + len(block) <= max_chars:
+            current.append(i)
+            size += len(block)
+        else:
+            current, size = [i], len(block)
+            batches.append(current)
+    return batches
+
+
+def split_whitespace(segment: str):
+    """Return (leading whitespace, core, trailing whitespace)."""
+    core = segment.strip()
+    if not core:
+        return segment, "", ""
+    lead = segment[:len(segment) - len(segment.lstrip())]
+    trail = segment[len(segment.rstrip()):]
+    return lead, core, trail
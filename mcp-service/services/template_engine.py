@@ -0,0 +1,84 @@
+import hashlib
+import random
+from string import Formatter
+
+
+class CompiledTemplate:
+    """A str.format-style template parsed once into (literal, field) pieces."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.pieces = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                raise ValueError(f"unsupported placeholder {{{field}}} in template: {source!r}")
+            self.pieces.append((literal, field))
+        self.fields = frozenset(field for _, field in self.pieces if field)
+
+    def render(self, variables: dict) -> str:
+        return "".join(literal + (str(variables[field]) if field else "") for literal, field in self.pieces)
+
+
+def stable_seed(*parts) -> int:
+    """Deterministic seed (unlike hash(), stable across processes and restarts)."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class TemplateEngine:
+    """
+    Precompiles {family: {level: [template, ...]}} and checks every
+    placeholder against the variable names each family provides, so a bad
+    template fails at import rather than as a KeyError mid-request.
+    """
+
+    def __init__(self, families: dict, variable_names):
+        self.families = {}
+        problems = []
+        for family, levels in families.items():
+            names = set(variable_names(family))
+            compiled = {}
+            for level, templates in levels.items():
+                compiled[level] = [CompiledTemplate(t) for t in templates]
+                for t in compiled[level]:
+                    missing = t.fields - names
+                    if missing:
+                        problems.append(f"{family}/{level}: {sorted(missing)} in {t.source!r}")
+            self.families[family] = compiled
+        if problems:
+            raise ValueError("templates reference unknown variables:\n" + "\n".join(problems))
+
+    def templates(self, family: str, level: str) -> list:
+        return self.families[family][level]
+
+    def choose(self, family: str, level: str, rng: random.Random) -> CompiledTemplate:
+        return rng.choice(self.families[family][level])
+
+
+def sample_distinct(templates: list, pools: dict, n: int, rng: random.Random) -> list:
+    """
+    Render up to n distinct items, sampling without replacement from the
+    combined space of (template, assignment of its placeholders). Fewer than
+    n items come back only when the space itself is smaller than n.
+    """
+    spaces = []
+    for template in templates:
+        fields = sorted(template.fields)
+        sizes = [len(pools[f]) for f in fields]
+        total = 1
+        for size in sizes:
+            total *= size
+        spaces.append((template, fields, sizes, total))
+    grand = sum(space[3] for space in spaces)
+    items = []
+    for idx in rng.sample(range(grand), min(n, grand)):
+        for template, fields, sizes, total in spaces:
+            if idx < total:
+                break
+            idx -= total
+        values = {}
+        for field, size in zip(fields, sizes):
+            idx, digit = divmod(idx, size)
+            values[field] = pools[field][digit]
+        items.append(template.render(values))
+    return items
@@ -1,12 +1,26 @@
-from schemas.translate import TranslateRequest, TranslateResponse
+from schemas.translate import TranslateRequest, TranslateResponse, MultiTranslateRequest
 from schemas.context import Context
 from transformers.cultural_adapter import apply_cultural_adaptation
 from utils.logger import get_logger
-from clients.openai_client import chat_adapt
+from utils.metrics import CACHE_EVENTS, FALLBACKS
+from clients.openai_client import chat_adapt, chat_adapt_stream
+from configs.settings import (TRANSLATE_SEGMENT_CHARS, TRANSLATE_CONCURRENCY,
+                              TRANSLATE_MULTI_CONCURRENCY,
+                              TM_ENABLED, TM_DB, TM_CACHE_SIZE, TM_FUZZY_THRESHOLD, GLOSSARY_DIR)
+from services.glossary import Glossary
+from services.segmentation import pack_blocks, split_blocks, split_whitespace
+from services.translation_memory import TranslationMemory
+import asyncio
 import json
 
 log = get_logger("translation_service")
 
+translation_memory = TranslationMemory(TM_DB, TM_CACHE_SIZE, TM_FUZZY_THRESHOLD) if TM_ENABLED else None
+
+# Separates the blocks packed into one LLM call so the reply can be split
+# back into per-block translations for the translation memory.
+BLOCK_MARKER = "<!-- block -->"
+
 # Language codes mapping
 LANGUAGE_CODES = {
     "en": "English",
@@ -23,44 +37,33 @@ LANGUAGE_CODES = {
     "ur": "Urdu"
 }
 
-# Educational domain-specific terminology for each language
-EDUCATIONAL_TERMS = {
-    "en": {
-        "lesson": "lesson",
-        "exercise": "exercise",
-        "quiz": "quiz",
-        "chapter": "chapter",
-        "mathematics": "mathematics",
-        "science": "science",
-        "history": "history",
-        "geography": "geography"
-    },
-    "hi": {
-        "lesson": "पाठ",
-        "exercise": "अभ्यास",
-        "quiz": "प्रश्नोत्तरी",
-        "chapter": "अध्याय",
-        "mathematics": "गणित",
-        "science": "विज्ञान",
-        "history": "इतिहास",
-        "geography": "भूगोल"
-    },
-    "pa": {
-        "lesson": "ਪਾਠ",
-        "exercise": "ਅਭਿਆਸ",
-        "quiz": "ਕੁਇਜ਼",
-        "chapter": "ਅਧਿਆਇ",
-        "mathematics": "ਗਣਿਤ",
-        "science": "ਵਿਗਿਆਨ",
-        "history": "ਇਤਿਹਾਸ",
-        "geography": "ਭੂਗੋਲ"
-    }
-    # Add more languages as needed
-}
+# Educational domain-specific terminology for every language, compiled once at startup
+glossary = Glossary.load(GLOSSARY_DIR)
 
-async def translate_text(request: TranslateRequest) -> TranslateResponse:
+def context_prompt_tail(context) -> str:
+    """The target-independent end of the translation prompt (student context, if any)."""
+    tail = """
     """
-    Translate text with context awareness for educational content
+    
+    # Apply cultural adaptation to context if provided
+    if context:
+        context = apply_cultural_adaptation(context)
+        tail += f"""
+        
+        CONTEXT INFORMATION:
+        - Student grade level: {context.user.grade}
+        - Subject: {context.content.subject}
+        - Region: {context.user.region}
+        - Learning style: {context.user.learning_style}
+        """
+    return tail
+
+def translation_prompt_builder(request: TranslateRequest, tail: str = None):
+    """
+    Prepare everything in the translation prompt except the text itself;
+    returns (make_prompt(text, references=()), source_lang, target_lang).
+    `references` are (source, translation) pairs from translation memory.
+    `tail` is a precomputed context_prompt_tail() shared across target languages.
     """
     source_lang = request.source_language or "en"
     target_lang = request.target_language
@@ -71,13 +74,11 @@ async def translate_text(request: TranslateRequest) -> TranslateResponse:
     
     log.info(f"Translating from {source_lang_name} to {target_lang_name}")
     
-    # Apply cultural adaptation to context if provided
-    context = request.context
-    if context:
-        context = apply_cultural_adaptation(context)
+    if tail is None:
+        tail = context_prompt_tail(request.context)
     
     # Prepare prompt for translation
-    prompt = f"""
+    head = f"""
     Translate the following educational content from {source_lang_name} to {target_lang_name}.
     
     IMPORTANT INSTRUCTIONS:
@@ -89,29 +90,175 @@ async def translate_text(request: TranslateRequest) -> TranslateResponse:
     6. Maintain any cultural references that are present in the original text
     
     TEXT TO TRANSLATE:
-    {request.text}
     """
     
-    # Add context information if available
-    if context:
-        prompt += f"""
-        
-        CONTEXT INFORMATION:
-        - Student grade level: {context.user.grade}
-        - Subject: {context.content.subject}
-        - Region: {context.user.region}
-        - Learning style: {context.user.learning_style}
-        """
-    
-    # Use domain-specific terminology if available
-    if target_lang in EDUCATIONAL_TERMS:
-        terms = EDUCATIONAL_TERMS[target_lang]
-        terms_str = "\n".join([f"{k}: {v}" for k, v in terms.items()])
-        prompt += f"""
+    def make_prompt(text: str, references=()) -> str:
+        prompt = head + text + tail
+        # Only the glossary terms that occur in this text go into the prompt
+        terms = glossary.prompt_lines(text, source_lang, target_lang)
+        if terms:
+            terms_str = "\n".join(terms)
+            prompt += f"""
         
         USE THESE DOMAIN-SPECIFIC TERMS:
         {terms_str}
         """
+        if BLOCK_MARKER in text:
+            prompt += f"""
+        
+        The text is made of independent blocks separated by {BLOCK_MARKER} lines.
+        Keep every separator line, unchanged, between the translated blocks.
+        """
+        if references:
+            pairs = "\n".join(f"Source: {source}\n        Translation: {translation}"
+                              for source, translation in references)
+            prompt += f"""
+        
+        REFERENCE TRANSLATIONS OF SIMILAR SEGMENTS (reuse their wording where it applies):
+        {pairs}
+        """
+        return prompt
+    
+    return make_prompt, source_lang, target_lang
+
+def build_translation_prompt(request: TranslateRequest):
+    """
+    Build the translation prompt; returns (prompt, source_lang, target_lang)
+    """
+    make_prompt, source_lang, target_lang = translation_prompt_builder(request)
+    return make_prompt(request.text), source_lang, target_lang
+
+def length_quality(original: str, translated: str) -> float:
+    # A good translation should have a similar length ratio to the original
+    length_ratio = min(len(original), len(translated)) / max(len(original), len(translated), 1)
+    return length_ratio * 0.8 + 0.2  # Scale to 0.2-1.0 range
+
+async def translate_batch(make_prompt, blocks: list, batch: list, references: list,
+                          semaphore: asyncio.Semaphore, source_lang: str, target_lang: str) -> dict:
+    """
+    Translate adjacent blocks (indices into `blocks`) in one LLM call and
+    return {index: translated text}; empty if the call failed, so the blocks
+    keep their original text. chat_adapt already retries upstream errors
+    within its deadline. With translation memory on, the blocks are sent
+    separated by BLOCK_MARKER and each translation is stored per block; if
+    the reply does not split back cleanly the span is used as a whole and
+    nothing is stored. Whitespace around blocks is kept so reassembly
+    preserves layout.
+    """
+    span = range(batch[0], batch[-1] + 1)
+    parts = [split_whitespace(blocks[i]) for i in batch]
+    if translation_memory is not None:
+        text = f"\n{BLOCK_MARKER}\n".join(core for _, core, _ in parts)
+    else:
+        text = "".join(blocks[i] for i in span).strip()
+    try:
+        async with semaphore:
+            translated = await chat_adapt(make_prompt(text, references))
+    except Exception as e:
+        log.warning(f"Segment translation failed: {str(e)}")
+        translated = ""
+    if not translated:
+        FALLBACKS.labels("translate_segment").inc()
+        return {}
+    if translation_memory is not None:
+        pieces = [piece.strip() for piece in translated.split(BLOCK_MARKER)]
+        if len(pieces) == len(batch) and all(pieces):
+            await asyncio.to_thread(translation_memory.put_many, source_lang, target_lang,
+                                    [(core, piece) for (_, core, _), piece in zip(parts, pieces)])
+            return {i: lead + piece + trail for i, (lead, _, trail), piece in zip(batch, parts, pieces)}
+        translated = "\n".join(line for line in translated.split("\n") if line.strip() != BLOCK_MARKER)
+    lead, _, trail = split_whitespace("".join(blocks[i] for i in span))
+    out = dict.fromkeys(span, "")
+    out[batch[0]] = lead + translated + trail
+    return out
+
+async def translate_segmented(request: TranslateRequest, blocks: list, max_chars: float, tail: str = None,
+                              semaphore: asyncio.Semaphore = None) -> TranslateResponse:
+    """
+    Translate text cut into blocks (segmentation.split_blocks). With
+    translation memory on, every block is looked up on its own, so a
+    sentence or boilerplate paragraph shared across lessons hits wherever
+    it appears: exact hits skip the LLM and near-duplicates go into the
+    prompt as references. The remaining adjacent blocks are packed into
+    LLM calls of about `max_chars`, run concurrently (bounded by
+    TRANSLATE_CONCURRENCY, or by a caller-supplied semaphore), and the text
+    is reassembled in order. Blocks whose call fails keep the original text
+    instead of discarding the whole translation.
+    """
+    make_prompt, source_lang, target_lang = translation_prompt_builder(request, tail)
+    semaphore = semaphore or asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+    out = list(blocks)
+    exact, references = 0, {}
+    parts = [split_whitespace(block) for block in blocks]
+    lookups = {}
+    if translation_memory is not None:
+        # SQLite reads and fuzzy-index scans block, so they run off the event loop.
+        wanted = [i for i, (_, core, _) in enumerate(parts) if core]
+        found = await asyncio.to_thread(translation_memory.lookup_many, source_lang, target_lang,
+                                        [parts[i][1] for i in wanted])
+        lookups = dict(zip(wanted, found))
+    for i, (remembered, reference) in lookups.items():
+        if remembered is not None:
+            CACHE_EVENTS.labels("translation_memory", "exact").inc()
+            lead, _, trail = parts[i]
+            out[i] = lead + remembered + trail
+            exact += 1
+            continue
+        CACHE_EVENTS.labels("translation_memory", "fuzzy" if reference else "miss").inc()
+        if reference:
+            references[i] = reference
+    hits = {i for i, (remembered, _) in lookups.items() if remembered is not None}
+    batches = pack_blocks(blocks, max_chars, hits)
+    results = await asyncio.gather(*(
+        translate_batch(make_prompt, blocks, batch, [references[i] for i in batch if i in references],
+                        semaphore, source_lang, target_lang)
+        for batch in batches
+    ))
+    failed = fuzzy = 0
+    for batch, done in zip(batches, results):
+        if not done:
+            failed += len(batch)
+            continue
+        fuzzy += sum(1 for i in batch if i in references)
+        for i, text in done.items():
+            out[i] = text
+    translated = "".join(out)
+    counted = exact + sum(len(batch) for batch in batches)
+    if counted and failed == counted:
+        log.error("Translation failed, returning original text")
+        quality_score = 0.0
+    else:
+        if failed:
+            log.error(f"{failed}/{counted} blocks kept their original text")
+        quality_score = length_quality(request.text, translated) * (1 - failed / counted if counted else 1)
+    return TranslateResponse(
+        translated_text=translated,
+        source_language=source_lang,
+        target_language=target_lang,
+        quality_score=quality_score,
+        context_preserved=failed == 0,
+        segments=counted,
+        tm_exact_hits=exact,
+        tm_fuzzy_hits=fuzzy,
+        tm_hit_rate=(exact / counted) if counted else None
+    )
+
+def segment_chars(request) -> float:
+    """Largest LLM call in characters; unbounded when segmentation is off for the request."""
+    segmented = request.segmented
+    if segmented is None:
+        segmented = len(request.text) > TRANSLATE_SEGMENT_CHARS
+    return TRANSLATE_SEGMENT_CHARS if segmented else float("inf")
+
+async def translate_text(request: TranslateRequest) -> TranslateResponse:
+    """
+    Translate text with context awareness for educational content
+    """
+    max_chars = segment_chars(request)
+    if len(request.text) > max_chars or translation_memory is not None:
+        return await translate_segmented(request, split_blocks(request.text), max_chars)
+
+    prompt, source_lang, target_lang = build_translation_prompt(request)
     
     try:
         # Use the OpenAI client for translation
@@ -128,11 +275,7 @@ async def translate_text(request: TranslateRequest) -> TranslateResponse:
             )
         
         # Calculate a simple quality score based on length ratio
-        # A good translation should have a similar length ratio to the original
-        original_length = len(request.text)
-        translated_length = len(translated)
-        length_ratio = min(original_length, translated_length) / max(original_length, translated_length)
-        quality_score = length_ratio * 0.8 + 0.2  # Scale to 0.2-1.0 range
+        quality_score = length_quality(request.text, translated)
         
         return TranslateResponse(
             translated_text=translated,
@@ -151,4 +294,60 @@ async def translate_text(request: TranslateRequest) -> TranslateResponse:
             target_language=target_lang,
             quality_score=0.0,
             context_preserved=False
-        )
\ No newline at end of file
+        )
+
+async def translate_text_stream(request: TranslateRequest):
+    """
+    Stream the translation as it is generated. Falls back to the original
+    text if the LLM produces nothing or fails before the first token.
+    """
+    prompt, _, _ = build_translation_prompt(request)
+    sent = False
+    try:
+        async for delta in chat_adapt_stream(prompt):
+            sent = True
+            yield delta
+    except Exception as e:
+        log.error(f"Streaming translation error: {str(e)}")
+        if sent:
+            return
+    if not sent:
+        log.error("Translation failed, returning original text")
+        yield request.text
+
+async def translate_multi_iter(request: MultiTranslateRequest):
+    """
+    Translate one text into several languages, yielding each TranslateResponse
+    as soon as its language is done. Block splitting and the student-context
+    part of the prompt are computed once; every language's LLM calls share one
+    semaphore of TRANSLATE_MULTI_CONCURRENCY slots.
+    """
+    targets = list(dict.fromkeys(request.target_languages))
+    if not targets:
+        return
+    blocks = split_blocks(request.text)
+    max_chars = segment_chars(request)
+    tail = context_prompt_tail(request.context)
+    semaphore = asyncio.Semaphore(TRANSLATE_MULTI_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(translate_segmented(TranslateRequest(
+            text=request.text,
+            target_language=lang,
+            source_language=request.source_language,
+            context=request.context,
+            preserve_formatting=request.preserve_formatting,
+            segmented=request.segmented,
+        ), blocks, max_chars, tail, semaphore))
+        for lang in targets
+    ]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def translate_multi(request: MultiTranslateRequest) -> dict:
+    """Collect translate_multi_iter() results keyed by target language, in request order."""
+    results = {r.target_language: r async for r in translate_multi_iter(request)}
+    return {lang: results[lang] for lang in dict.fromkeys(request.target_languages)}
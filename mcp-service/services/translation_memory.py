@@ -0,0 +1,171 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from utils.cache import TTLCache
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_segment(text: str) -> str:
+    return _WS.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def _shingles(text: str, n: int = 3) -> set:
+    padded = f" {text.lower()} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+class _FuzzyIndex:
+    """
+    Character-trigram inverted index over the stored segments of one
+    language pair, holding at most `limit` segments; the oldest are evicted.
+    """
+
+    # Trigrams shared by this many segments carry almost no signal; skip them.
+    MAX_POSTINGS = 5000
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._entries = {}  # id -> [segment, translation, shingles], oldest first
+        self._ids = {}
+        self._postings = {}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, segment: str, translation: str):
+        idx = self._ids.get(segment)
+        if idx is not None:
+            self._entries[idx][1] = translation
+            return
+        shingles = _shingles(segment)
+        idx = self._next_id
+        self._next_id += 1
+        self._entries[idx] = [segment, translation, shingles]
+        self._ids[segment] = idx
+        for sh in shingles:
+            self._postings.setdefault(sh, set()).add(idx)
+        while len(self._entries) > self.limit:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, idx: int):
+        segment, _, shingles = self._entries.pop(idx)
+        del self._ids[segment]
+        for sh in shingles:
+            ids = self._postings[sh]
+            ids.discard(idx)
+            if not ids:
+                del self._postings[sh]
+
+    def best(self, segment: str, threshold: float):
+        """Return (similarity, source, translation) of the closest stored segment, or None."""
+        query = _shingles(segment)
+        overlap = Counter()
+        for sh in query:
+            ids = self._postings.get(sh)
+            if ids and len(ids) <= self.MAX_POSTINGS:
+                overlap.update(ids)
+        best = None
+        for idx, shared in overlap.most_common(20):
+            source, translation, shingles = self._entries[idx]
+            if source == segment:
+                continue
+            similarity = shared / (len(query) + len(shingles) - shared)
+            if similarity >= threshold and (best is None or similarity > best[0]):
+                best = (similarity, source, translation)
+        return best
+
+
+class TranslationMemory:
+    """
+    Segment-level translation memory keyed by (source_lang, target_lang,
+    normalized segment). SQLite is the source of truth; an LRU fronts exact
+    lookups and a per-language-pair n-gram index of the `index_limit` most
+    recent segments serves near-duplicates. Methods block (SQLite, index
+    scans); async callers use lookup_many()/put_many() via asyncio.to_thread.
+    """
+
+    def __init__(self, db_path: str = "", cache_size: int = 10000, fuzzy_threshold: float = 0.75,
+                 index_limit: int = 50000):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.index_limit = index_limit
+        self._cache = TTLCache(cache_size, ttl=float("inf"))
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tm (source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, "
+                "segment TEXT NOT NULL, translation TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (source_lang, target_lang, segment))"
+            )
+            self._conn.commit()
+
+    def _index(self, source_lang: str, target_lang: str) -> _FuzzyIndex:
+        pair = (source_lang, target_lang)
+        index = self._indexes.get(pair)
+        if index is None:
+            index = _FuzzyIndex(self.index_limit)
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT segment, translation FROM tm WHERE source_lang = ? AND target_lang = ? "
+                    "ORDER BY updated_at DESC LIMIT ?", (source_lang, target_lang, self.index_limit)
+                ).fetchall()
+            for segment, translation in reversed(rows):
+                index.add(segment, translation)
+            self._indexes[pair] = index
+        return index
+
+    def get(self, source_lang: str, target_lang: str, segment: str):
+        key = (source_lang, target_lang, normalize_segment(segment))
+        hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM tm WHERE source_lang = ? AND target_lang = ? AND segment = ?", key
+            ).fetchone()
+        if row is None:
+            return None
+        self._cache.set(key, row[0])
+        return row[0]
+
+    def similar(self, source_lang: str, target_lang: str, segment: str):
+        """Closest stored (source, translation) above the fuzzy threshold, or None."""
+        with self._index_lock:
+            found = self._index(source_lang, target_lang).best(normalize_segment(segment), self.fuzzy_threshold)
+        return found[1:] if found else None
+
+    def lookup_many(self, source_lang: str, target_lang: str, segments: list) -> list:
+        """(exact translation or None, similar (source, translation) or None) per segment."""
+        out = []
+        for segment in segments:
+            exact = self.get(source_lang, target_lang, segment)
+            out.append((exact, None if exact is not None else self.similar(source_lang, target_lang, segment)))
+        return out
+
+    def put(self, source_lang: str, target_lang: str, segment: str, translation: str):
+        self.put_many(source_lang, target_lang, [(segment, translation)])
+
+    def put_many(self, source_lang: str, target_lang: str, pairs: list):
+        """Store (segment, translation) pairs in one transaction."""
+        rows = [(source_lang, target_lang, normalize_segment(segment), translation) for segment, translation in pairs]
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tm (source_lang, target_lang, segment, translation, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)", [row + (now,) for row in rows]
+            )
+            self._conn.commit()
+        with self._index_lock:
+            index = self._indexes.get((source_lang, target_lang))
+            for row in rows:
+                self._cache.set(row[:3], row[3])
+                if index is not None:
+                    index.add(row[2], row[3])
@@ -0,0 +1,30 @@
+import time
+
+from utils.cache import TTLCache, TieredCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_tiered_cache_survives_restart(tmp_path):
+    db = str(tmp_path / "cache.db")
+    first = TieredCache(maxsize=10, ttl=60, db_path=db)
+    first.set("k", {"adapted_text": "hello"})
+    second = TieredCache(maxsize=10, ttl=60, db_path=db)
+    assert second.get("k") == {"adapted_text": "hello"}
+    assert second.stats()["hits"] == 1
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from schemas.context import Context, UserCtx, DeviceCtx, ContentCtx
+from transformers.cultural_adapter import apply_cultural_adaptation, region_bundle
+
+
+def make_ctx(region="Punjab"):
+    return Context(user=UserCtx(region=region), device=DeviceCtx(), content=ContentCtx())
+
+
+def test_requests_get_their_own_preferences():
+    first = apply_cultural_adaptation(make_ctx())
+    first.user.cultural_preferences["language"] = "changed"
+    second = apply_cultural_adaptation(make_ctx())
+    assert second.user.cultural_preferences["language"] == "Punjabi"
+
+
+def test_bundle_mappings_are_read_only():
+    bundle = region_bundle("Punjab")
+    with pytest.raises(TypeError):
+        bundle.preferences[(True, "high")]["language"] = "changed"
+    with pytest.raises(TypeError):
+        bundle.data["language"] = "changed"
+    with pytest.raises(AttributeError):
+        bundle.data["examples"].append("changed")
+
+
+def test_prompt_carries_regional_examples_unless_disabled():
+    from prompt.builder import build_prompt
+
+    ctx = apply_cultural_adaptation(make_ctx("Kerala"))
+    assert region_bundle("Kerala").prompt_fragment in build_prompt(ctx, "Lesson text", {})
+    ctx.user.local_examples = False
+    assert "Local context" not in build_prompt(ctx, "Lesson text", {})
@@ -0,0 +1,24 @@
+import os
+
+from services.glossary import AhoCorasick, Glossary
+
+GLOSSARY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "glossary")
+
+
+def test_matcher_finds_overlapping_patterns_in_one_pass():
+    matcher = AhoCorasick({"his": "his", "history": "history", "story": "story"})
+    assert matcher.find("our history lessons") == {"his", "history"}
+    assert matcher.find("a story of his") == {"story", "his"}
+
+
+def test_only_terms_present_in_text_are_injected():
+    glossary = Glossary.load(GLOSSARY_DIR)
+    lines = glossary.prompt_lines("Read the Chapter, then answer each question.", "en", "hi")
+    assert lines == ["chapter: अध्याय", "question: प्रश्न", "answer: उत्तर"]
+    assert glossary.prompt_lines("Prehistory of plants", "en", "hi") == []
+
+
+def test_every_supported_language_has_a_glossary():
+    glossary = Glossary.load(GLOSSARY_DIR)
+    assert set(glossary.terms) == {"en", "hi", "pa", "ta", "te", "mr", "bn", "gu", "kn", "ml", "or", "ur"}
+    assert all(set(terms) == set(glossary.terms["en"]) for terms in glossary.terms.values())
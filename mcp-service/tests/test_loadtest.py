@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from loadtest.latency import parse_latency, percentile
+
+
+def test_latency_specs():
+    random.seed(0)
+    assert parse_latency("fixed:0.25")() == 0.25
+    assert all(0.1 <= parse_latency("uniform:0.1,0.2")() <= 0.2 for _ in range(50))
+    assert all(parse_latency("normal:0.01,1")() >= 0 for _ in range(50))
+    samples = sorted(parse_latency("lognormal:0.5,0.3")() for _ in range(2001))
+    assert 0.4 < samples[1000] < 0.6
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+
+
+def test_nearest_rank_percentiles():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+
+from utils.metrics import StatsCollector, observe_stage, timed
+from utils.pipeline import Pipeline, Stage
+from utils.tracing import current_trace, end_trace, start_trace
+
+
+def _collector_count():
+    return REGISTRY.get_sample_value("mcp_stage_seconds_count", {"stage": "collectors"}) or 0.0
+
+
+def test_stages_are_traced_only_inside_a_trace():
+    before = _collector_count()
+    with timed("collectors"):
+        pass
+    trace, token = start_trace("abc")
+    try:
+        with timed("collectors"):
+            pass
+
+        async def run():
+            result = await Pipeline([Stage("a", lambda r: 1), Stage("b", lambda r: r["a"], deps=("a",))]).run({})
+            for name, started in result.starts.items():
+                observe_stage(name, result.timings[name] / 1000, started)
+
+        asyncio.run(run())
+    finally:
+        end_trace(token)
+    assert current_trace() is None
+    report = trace.to_dict(route="/adapt")
+    assert report["trace_id"] == "abc"
+    assert [s["name"] for s in report["spans"]] == ["collectors", "a", "b"]
+    assert _collector_count() - before == 2
+
+
+def test_component_stats_are_flattened_into_gauges():
+    registry, collector = CollectorRegistry(), StatsCollector()
+    registry.register(collector)
+    collector.add("test_cache", lambda: {"hits": 3, "breaker": {"failures": 1, "state": "open"}, "on": True})
+    text = generate_latest(registry).decode()
+    assert 'mcp_component_stat{component="test_cache",stat="hits"} 3.0' in text
+    assert 'stat="breaker.failures"' in text and 'stat="breaker.state"' not in text and 'stat="on"' not in text
@@ -0,0 +1,34 @@
+import asyncio
+
+from utils.pipeline import Pipeline, Stage
+
+
+def test_independent_stages_overlap():
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    pipeline = Pipeline([
+        Stage("a", lambda r: slow(1)),
+        Stage("b", lambda r: slow(2)),
+        Stage("sum", lambda r: r["a"] + r["b"] + r["x"], deps=("a", "b")),
+    ])
+    result = asyncio.run(pipeline.run({"x": 10}))
+    assert result.results["sum"] == 13 and result.timed_out == []
+    assert set(result.timings) == {"a", "b", "sum", "total"}
+    # b started while a was still sleeping, rather than after it finished
+    a_ends = result.starts["a"] + result.timings["a"] / 1000
+    assert result.starts["b"] < a_ends
+
+
+def test_stage_deadline_falls_back_to_default():
+    async def never():
+        await asyncio.sleep(10)
+
+    pipeline = Pipeline([
+        Stage("ml", lambda r: never(), timeout=0.01, default={"score": 0.5}),
+        Stage("prompt", lambda r: f"score={r['ml']['score']}", deps=("ml",)),
+    ])
+    result = asyncio.run(pipeline.run({}))
+    assert result.results["prompt"] == "score=0.5"
+    assert result.timed_out == ["ml"]
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from policies import short_on_mobile
+from policies.base import Policy, PolicyRegistry
+from policies.registry import chain_for
+
+
+def _ctx(grade=4, is_mobile=True):
+    return SimpleNamespace(user=SimpleNamespace(grade=grade), device=SimpleNamespace(is_mobile=is_mobile))
+
+
+def test_single_pass_applies_prefix_then_bullets():
+    text = "  intro\n\n" + "y" * 200 + "\nend\n"
+    long_line = "• " + "y" * 120 + "…"
+    expected = {
+        (3, True): "• Use simple words.   intro\n" + long_line + "\n• end",
+        (3, False): "Use simple words. " + text,
+        (9, True): "• intro\n" + long_line + "\n• end",
+        (9, False): text,
+    }
+    for (grade, is_mobile), out in expected.items():
+        assert chain_for(_ctx(grade, is_mobile)).apply(text) == out
+
+
+def test_chain_is_cached_per_applicability_pattern():
+    assert chain_for(_ctx(grade=2)) is chain_for(_ctx(grade=4))
+    assert chain_for(_ctx(grade=2)) is not chain_for(_ctx(grade=8))
+
+
+def test_registered_policy_joins_the_same_pass():
+    class Shout(Policy):
+        name = "shout"
+
+        def applies(self, ctx):
+            return ctx.device.is_mobile
+
+        def line(self, text):
+            return text.upper()
+
+    registry = PolicyRegistry([short_on_mobile.policy])
+    assert registry.chain_for(_ctx()).apply("a\nb") == "• a\n• b"
+    registry.register(Shout())
+    assert registry.chain_for(_ctx()).apply("a\n\nb") == "• A\n• B"
+    assert registry.chain_for(_ctx(is_mobile=False)).apply("a\n\nb") == "a\n\nb"
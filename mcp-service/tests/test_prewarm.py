@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("httpx")
+
+import prewarm
+
+
+def test_grade_bands_and_locales():
+    assert prewarm.parse_grades("1-3,8,2") == [1, 2, 3, 8]
+    assert prewarm.parse_locales("pa:Punjab, ta:Tamil Nadu") == [("pa", "Punjab"), ("ta", "Tamil Nadu")]
+
+
+def test_resume_skips_checkpointed_cohorts_and_respects_budget(monkeypatch, tmp_path):
+    calls, cache = [], {}
+
+    async def fake_run(ctx, lesson_content, key, cache_ttl=None):
+        calls.append(key)
+        cache[key] = {"ttl": cache_ttl}
+        return {}, True, None
+
+    async def noop():
+        return None
+
+    monkeypatch.setattr(prewarm, "run_adaptation", fake_run)
+    monkeypatch.setattr(prewarm, "start_pool", noop)
+    monkeypatch.setattr(prewarm, "close_pool", noop)
+    monkeypatch.setattr(prewarm.adapt_cache, "get", cache.get)
+    catalog = [{"lesson_content": "Add 2 and 3.", "subject": "math", "difficulty": "easy"}]
+
+    def requests():
+        return prewarm.cohort_requests(catalog, [("hi", "Punjab")], [3, 4, 5], ["mobile", "desktop"])
+
+    checkpoint = str(tmp_path / "done")
+    first = asyncio.run(prewarm.prewarm(requests(), 2, prewarm.RateBudget(0, 4), checkpoint))
+    assert first["warmed"] == 4 and first["budget_exhausted"]
+
+    second = asyncio.run(prewarm.prewarm(requests(), 2, prewarm.RateBudget(0, 0), checkpoint))
+    assert second["skipped"] == 4 and second["warmed"] == 2
+    assert len(set(calls)) == 6
+
+    cache.clear()  # every entry expired: the checkpoint alone must not skip them
+    third = asyncio.run(prewarm.prewarm(requests(), 2, prewarm.RateBudget(0, 0), checkpoint, ttl=86400))
+    assert third["warmed"] == 6 and third["expired"] == 6
+    assert {entry["ttl"] for entry in cache.values()} == {86400}
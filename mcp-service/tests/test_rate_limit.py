@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.rate_limit import AdaptiveConcurrency, QueueTimeout, RateLimiter, TokenBucket, retry_after
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=60)  # one unit per second
+    bucket.take(60)
+    assert 0.9 < bucket.wait_time(1) <= 1.0
+    assert TokenBucket(per_minute=0).wait_time(10 ** 6) == 0.0
+
+
+def test_limiter_times_out_instead_of_overrunning_the_budget():
+    limiter = RateLimiter(rpm=600, tpm=0)  # ten requests a second
+
+    async def run():
+        deadline = time.monotonic() + 0.05
+        for _ in range(601):  # one more than the full bucket
+            await limiter.acquire(1, deadline)
+
+    with pytest.raises(QueueTimeout):
+        asyncio.run(run())
+    assert limiter.timeouts == 1
+
+
+def test_aimd_grows_on_fast_success_and_halves_on_overload():
+    aimd = AdaptiveConcurrency(initial=4, minimum=1, maximum=16, latency_target=1.0, cooldown=0)
+    for _ in range(8):
+        aimd.on_success(0.1)
+    assert 5 <= aimd.limit < 7
+    aimd.on_overload()
+    assert aimd.limit < 3.5
+    aimd.on_success(5.0)  # slower than the target counts as overload
+    assert aimd.limit < 1.8
+
+
+def test_slots_queue_until_released_or_deadline():
+    aimd = AdaptiveConcurrency(initial=1, minimum=1, maximum=1, latency_target=0)
+    order = []
+
+    async def job(name, hold):
+        async with aimd.slot(time.monotonic() + 1) as slot:
+            order.append(name)
+            await asyncio.sleep(hold)
+            slot.success()
+
+    async def run():
+        await asyncio.gather(job("a", 0.02), job("b", 0))
+        async with aimd.slot(time.monotonic() + 1):
+            with pytest.raises(QueueTimeout):
+                await aimd.acquire(time.monotonic() + 0.02)
+
+    asyncio.run(run())
+    assert order == ["a", "b"] and aimd.in_flight == 0
+
+
+def test_retry_after_forms():
+    assert retry_after({"retry-after": "2"}) == 2.0
+    assert retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert retry_after({}) is None
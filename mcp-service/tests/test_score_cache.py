@@ -0,0 +1,133 @@
+import asyncio
+
+from services.score_cache import DEFAULT_SCORE, ScoreCache
+from utils.circuit_breaker import CircuitBreaker
+
+
+class FakeML:
+    def __init__(self):
+        self.calls = 0
+        self.down = False
+        self.version = "v1"
+        self.score = 0.8
+
+    async def one(self, key):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("ml-service down")
+        return {"score": self.score, "label": "high"}
+
+    async def many(self, keys):
+        return [await self.one(k) for k in keys]
+
+    async def current(self):
+        if self.down:
+            raise ConnectionError("ml-service down")
+        return self.version
+
+
+def make_cache(ml, **kw):
+    kw.setdefault("version_check_interval", 3600)
+    return ScoreCache(ml.one, ml.many, ml.current, CircuitBreaker(2, 60), **kw)
+
+
+def test_fresh_hits_skip_upstream():
+    ml = FakeML()
+    cache = make_cache(ml)
+
+    async def run():
+        return [await cache.get((5, "math", "easy")) for _ in range(3)]
+
+    assert all(r["score"] == 0.8 for r in asyncio.run(run()))
+    assert ml.calls == 1
+
+
+def test_stale_entry_served_while_refreshing():
+    ml = FakeML()
+    cache = make_cache(ml, ttl=0, stale=60)
+
+    async def run():
+        first = await cache.get((5, "math", "easy"))
+        ml.score = 0.2
+        second = await cache.get((5, "math", "easy"))
+        await asyncio.sleep(0.01)
+        third = await cache.get((5, "math", "easy"))
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first["score"] == 0.8 and second["score"] == 0.8
+    assert third["score"] == 0.2
+
+
+def test_open_breaker_serves_cached_or_default_without_calling():
+    ml = FakeML()
+    cache = make_cache(ml, ttl=0, stale=0)
+
+    async def run():
+        await cache.get((5, "math", "easy"))
+        ml.down = True
+        results = [await cache.get((5, "math", "easy")), await cache.get((6, "science", "hard"))]
+        calls = ml.calls
+        results.append(await cache.get((7, "math", "hard")))
+        return results, calls
+
+    (cached, default, after_open), calls = asyncio.run(run())
+    assert cached["score"] == 0.8
+    assert default == DEFAULT_SCORE and after_open == DEFAULT_SCORE
+    assert cache.breaker.state == "open"
+    assert ml.calls == calls
+
+
+def test_new_model_version_drops_cache():
+    ml = FakeML()
+    cache = make_cache(ml, version_check_interval=0)
+
+    async def run():
+        await cache.get((5, "math", "easy"))
+        await asyncio.sleep(0.01)
+        ml.version, ml.score = "v2", 0.3
+        await cache.get((5, "math", "easy"))  # still the v1 score; triggers the version check
+        await asyncio.sleep(0.01)
+        return await cache.get((5, "math", "easy"))
+
+    assert asyncio.run(run())["score"] == 0.3
+    assert cache.invalidations == 1
+
+
+def test_get_many_batches_misses_and_keeps_order():
+    ml = FakeML()
+    cache = make_cache(ml)
+    keys = [(5, "math", "easy"), (6, "math", "easy"), (5, "math", "easy")]
+    results = asyncio.run(cache.get_many(keys))
+    assert len(results) == 3 and ml.calls == 2
+
+
+def test_breaker_half_open_probe():
+    breaker = CircuitBreaker(1, 0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_cancelled_probe_releases_half_open_breaker():
+    ml = FakeML()
+    cache = ScoreCache(ml.one, ml.many, ml.current, CircuitBreaker(1, 0), version_check_interval=3600)
+    cache.breaker.record_failure()
+
+    async def hang(keys):
+        await asyncio.sleep(60)
+
+    async def run():
+        cache.fetch_many = hang
+        task = asyncio.ensure_future(cache.get_many([(5, "math", "easy")]))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    assert cache.breaker.state == "half_open" and cache.breaker.allow()
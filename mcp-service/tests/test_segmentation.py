@@ -0,0 +1,29 @@
+from services.segmentation import pack_blocks, split_blocks, split_whitespace
+
+
+def test_blocks_reassemble_to_original():
+    text = "<h1>Fractions</h1>\n<p>One half.</p>\n\nPlain paragraph.\n\n<ul><li>a</li><li>b</li></ul>"
+    assert "".join(split_blocks(text)) == text
+    for size in (1, 20, 60, 1000):
+        batches = pack_blocks(split_blocks(text), size)
+        assert [i for batch in batches for i in batch] == [0, 1, 3, 4]
+
+
+def test_never_splits_inside_an_open_block():
+    text = "<ul><li>" + "a" * 50 + "</li><li>" + "b" * 50 + "</li></ul><p>next</p>"
+    blocks = split_blocks(text)
+    assert blocks == ["<ul><li>" + "a" * 50 + "</li><li>" + "b" * 50 + "</li></ul>", "<p>next</p>"]
+    assert pack_blocks(blocks, 30) == [[0], [1]]
+
+
+def test_short_text_stays_in_one_batch():
+    assert pack_blocks(split_blocks("<p>a</p><p>b</p>"), 1000) == [[0, 1]]
+
+
+def test_breaks_end_a_batch():
+    blocks = split_blocks("<p>a</p><p>b</p><p>c</p><p>d</p>")
+    assert pack_blocks(blocks, 1000, breaks={1}) == [[0], [2, 3]]
+
+
+def test_split_whitespace():
+    assert split_whitespace("\n  <p>x</p>\n") == ("\n  ", "<p>x</p>", "\n")
@@ -0,0 +1,34 @@
+import asyncio
+
+from utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    upstream = []
+
+    async def call():
+        upstream.append(1)
+        await asyncio.sleep(0.01)
+        return "adapted"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("prompt", call) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["adapted"] * 5
+    assert len(upstream) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "inflight": 0}
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("429")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("prompt", call) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from prompt.stream import StreamPostprocessor
+
+
+def _ctx(grade=7, is_mobile=True):
+    return SimpleNamespace(user=SimpleNamespace(grade=grade), device=SimpleNamespace(is_mobile=is_mobile))
+
+
+def _stream(ctx, text, size):
+    pp = StreamPostprocessor(ctx)
+    out = "".join(pp.feed(text[i:i + size]) for i in range(0, len(text), size))
+    return out + pp.close()
+
+
+def test_streamed_bullets_match_full_text_postprocess():
+    text = "  First line  \n\n" + "x" * 130 + "\nlast   words   \n"
+    expected = "• First line\n• " + "x" * 120 + "…\n• last   words"
+    for size in (1, 3, 7, len(text)):
+        assert _stream(_ctx(), text, size) == expected
+
+
+def test_reading_level_prefix_is_sent_first():
+    assert _stream(_ctx(grade=4, is_mobile=False), "abc", 1) == "Use simple words. abc"
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from services.template_engine import CompiledTemplate, TemplateEngine, sample_distinct, stable_seed
+
+
+def test_compiled_template_matches_str_format():
+    source = "In {region}, {person} buys {quantity} {local_item}s."
+    variables = {"region": "Kerala", "person": "Meera", "quantity": 4, "local_item": "appam"}
+    assert CompiledTemplate(source).render(variables) == source.format(**variables)
+
+
+def test_unknown_placeholders_fail_at_compile_time():
+    with pytest.raises(ValueError):
+        TemplateEngine({"math": {"low": ["{price} {missing}"]}}, lambda family: {"price"})
+
+
+def test_seeded_choice_is_reproducible():
+    engine = TemplateEngine({"math": {"low": ["a {x}", "b {x}", "c {x}"]}}, lambda family: {"x"})
+    seed = stable_seed("user-1", "lesson-9")
+    picks = {engine.choose("math", "low", random.Random(seed)).source for _ in range(5)}
+    assert len(picks) == 1
+
+
+def test_sample_distinct_never_repeats_and_caps_at_space_size():
+    engine = TemplateEngine({"math": {"low": ["{a}+{b}", "fixed"]}}, lambda family: {"a", "b"})
+    pools = {"a": (1, 2, 3), "b": (4, 5)}
+    items = sample_distinct(engine.templates("math", "low"), pools, 100, random.Random(3))
+    assert len(items) == len(set(items)) == 7
+    assert "fixed" in items
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("httpx")
+
+from schemas.translate import MultiTranslateRequest
+from services import translation
+
+
+def test_multi_translates_each_language_once_with_bounded_concurrency(monkeypatch):
+    active, peak, prompts = 0, 0, []
+
+    async def fake_chat(prompt):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "translated"
+
+    monkeypatch.setattr(translation, "chat_adapt", fake_chat)
+    monkeypatch.setattr(translation, "translation_memory", None)
+    monkeypatch.setattr(translation, "TRANSLATE_MULTI_CONCURRENCY", 2)
+    req = MultiTranslateRequest(text="<p>Add 2 and 3.</p>", target_languages=["hi", "ta", "hi", "bn"])
+
+    results = asyncio.run(translation.translate_multi(req))
+
+    assert list(results) == ["hi", "ta", "bn"]
+    assert all(r.translated_text == "translated" for r in results.values())
+    assert len(prompts) == 3 and peak == 2
+
+
+def test_multi_with_no_targets_is_empty():
+    req = MultiTranslateRequest(text="x", target_languages=[])
+    assert asyncio.run(translation.translate_multi(req)) == {}
+
+
+def test_failed_segment_keeps_source_without_retrying(monkeypatch):
+    calls = []
+
+    async def failing_chat(prompt):
+        calls.append(prompt)
+        raise RuntimeError("503 after client retries")
+
+    monkeypatch.setattr(translation, "chat_adapt", failing_chat)
+    monkeypatch.setattr(translation, "translation_memory", None)
+    req = MultiTranslateRequest(text="<p>Add 2 and 3.</p>", target_languages=["hi"])
+
+    result = asyncio.run(translation.translate_multi(req))["hi"]
+
+    assert result.translated_text == "<p>Add 2 and 3.</p>" and not result.context_preserved
+    assert len(calls) == 1
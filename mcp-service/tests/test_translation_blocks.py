@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("httpx")
+
+from schemas.translate import TranslateRequest
+from services import translation
+from services.translation_memory import TranslationMemory
+
+
+def _blocks_in(prompt):
+    return 1 + sum(1 for line in prompt.split("\n") if line.strip() == translation.BLOCK_MARKER)
+
+
+def _translate(text):
+    return asyncio.run(translation.translate_text(TranslateRequest(text=text, target_language="hi")))
+
+
+def test_shared_block_hits_memory_in_another_lesson(monkeypatch):
+    calls = []
+
+    async def fake_chat(prompt):
+        calls.append(_blocks_in(prompt))
+        return f"\n{translation.BLOCK_MARKER}\n".join(f"<p>T{len(calls)}.{n}</p>" for n in range(calls[-1]))
+
+    tm = TranslationMemory()
+    monkeypatch.setattr(translation, "chat_adapt", fake_chat)
+    monkeypatch.setattr(translation, "translation_memory", tm)
+
+    first = _translate("<p>Read carefully.</p>\n<p>Add 2 and 3.</p>")
+    second = _translate("<p>Subtract 1 from 4.</p>\n<p>Read carefully.</p>")
+
+    assert first.translated_text == "<p>T1.0</p>\n<p>T1.1</p>"
+    assert calls == [2, 1]
+    assert second.translated_text == "<p>T2.0</p>\n<p>T1.0</p>"
+    assert second.tm_exact_hits == 1 and second.segments == 2
+    assert tm.get("en", "hi", "<p>Subtract 1 from 4.</p>") == "<p>T2.0</p>"
+
+
+def test_reply_without_separators_is_used_whole_and_not_stored(monkeypatch):
+    async def fake_chat(prompt):
+        return "<p>both</p>"
+
+    tm = TranslationMemory()
+    monkeypatch.setattr(translation, "chat_adapt", fake_chat)
+    monkeypatch.setattr(translation, "translation_memory", tm)
+
+    result = _translate("<p>One.</p>\n\n<p>Two.</p>\n")
+
+    assert result.translated_text == "<p>both</p>\n"
+    assert tm.get("en", "hi", "<p>One.</p>") is None
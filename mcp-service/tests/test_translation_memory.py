@@ -0,0 +1,35 @@
+from services.translation_memory import TranslationMemory, normalize_segment
+
+
+def test_exact_hit_ignores_whitespace_differences():
+    tm = TranslationMemory()
+    tm.put("en", "hi", "Read the  chapter\ncarefully.", "अध्याय ध्यान से पढ़ें।")
+    assert tm.get("en", "hi", "Read the chapter carefully.") == "अध्याय ध्यान से पढ़ें।"
+    assert tm.get("en", "pa", "Read the chapter carefully.") is None
+
+
+def test_near_duplicate_is_found_as_reference():
+    tm = TranslationMemory(fuzzy_threshold=0.6)
+    tm.put("en", "hi", "Answer the following questions in your notebook.", "अपनी नोटबुक में निम्नलिखित प्रश्नों के उत्तर दें।")
+    found = tm.similar("en", "hi", "Answer the following questions in your copy.")
+    assert found is not None
+    assert found[0] == normalize_segment("Answer the following questions in your notebook.")
+    assert tm.similar("en", "hi", "Photosynthesis makes food for plants.") is None
+
+
+def test_memory_persists_in_sqlite(tmp_path):
+    db = str(tmp_path / "tm.db")
+    TranslationMemory(db).put("en", "ta", "Lesson", "பாடம்")
+    assert TranslationMemory(db).get("en", "ta", "Lesson") == "பாடம்"
+
+
+def test_fuzzy_index_evicts_oldest_segments_past_its_limit():
+    tm = TranslationMemory(fuzzy_threshold=0.6, index_limit=2)
+    tm.similar("en", "hi", "warm up")  # builds the index so puts feed it
+    tm.put("en", "hi", "Answer the following questions in your notebook.", "a")
+    tm.put("en", "hi", "Photosynthesis makes food for plants.", "b")
+    tm.put("en", "hi", "Plants need sunlight and water to grow.", "c")
+    assert len(tm._indexes[("en", "hi")]) == 2
+    assert tm.similar("en", "hi", "Answer the following questions in your copy.") is None
+    assert tm.similar("en", "hi", "Photosynthesis makes food for the plants.") is not None
+    assert tm.get("en", "hi", "Answer the following questions in your notebook.") == "a"
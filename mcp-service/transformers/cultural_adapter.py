@@ -1,5 +1,8 @@
 from schemas.context import Context
 from utils.logger import get_logger
+from configs.settings import CULTURAL_CONTEXTS_FILE
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
 import json
 
 log = get_logger("cultural_adapter")
@@ -99,34 +102,111 @@ DEFAULT_CONTEXT = {
 }
 
 
+ADAPTATION_LEVELS = ("none", "low", "medium", "high")
+
+
+class RegionBundle(NamedTuple):
+    """
+    Everything a request needs from a region's cultural table, built once at
+    startup. Every level is read-only (mapping proxies and tuples); requests
+    get their own copy of the preferences they use.
+    """
+    region: str
+    data: Mapping
+    json: str
+    preferences: Mapping  # (local_examples, adaptation_level) -> read-only preferences
+    prompt_fragment: str
+
+
+def load_cultural_contexts(path: str):
+    """Merge regions from an external JSON file ({region: {...}}) into CULTURAL_CONTEXTS."""
+    with open(path, encoding="utf-8") as f:
+        extra = json.load(f)
+    for region, data in extra.items():
+        CULTURAL_CONTEXTS[region] = dict(DEFAULT_CONTEXT, **data)
+    log.info(f"Loaded {len(extra)} cultural regions from {path}")
+
+
+def _preferences(data: dict, local_examples: bool, level: str) -> dict:
+    return {
+        "language": data["language"],
+        "use_local_examples": "true" if local_examples else "false",
+        "adaptation_level": level
+    }
+
+
+def _freeze(value):
+    """Read-only copy: dicts become mapping proxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def build_region_bundle(region: str, data: dict) -> RegionBundle:
+    return RegionBundle(
+        region=region,
+        data=_freeze(data),
+        json=json.dumps(data),
+        preferences=MappingProxyType({
+            (local, level): MappingProxyType(_preferences(data, local, level))
+            for local in (True, False) for level in ADAPTATION_LEVELS
+        }),
+        prompt_fragment=(
+            f"Local context ({region}): examples such as {', '.join(data['examples'])}; "
+            f"festivals {', '.join(data['festivals'])}; food {', '.join(data['food'])}; "
+            f"landmarks {', '.join(data['landmarks'])}."
+        ),
+    )
+
+
+def build_region_bundles():
+    global REGION_BUNDLES, DEFAULT_BUNDLE
+    REGION_BUNDLES = {region: build_region_bundle(region, data) for region, data in CULTURAL_CONTEXTS.items()}
+    DEFAULT_BUNDLE = build_region_bundle("default", DEFAULT_CONTEXT)
+
+
+def region_bundle(region: str) -> RegionBundle:
+    return REGION_BUNDLES.get(region, DEFAULT_BUNDLE)
+
+
+def regional_examples(ctx: Context) -> str:
+    """The region's prompt fragment, or "" when adaptation or local examples are off."""
+    if ctx.content.adaptation_level == "none" or not ctx.user.local_examples:
+        return ""
+    return region_bundle(ctx.user.region).prompt_fragment
+
+
+REGION_BUNDLES = {}
+DEFAULT_BUNDLE = None
+if CULTURAL_CONTEXTS_FILE:
+    load_cultural_contexts(CULTURAL_CONTEXTS_FILE)
+build_region_bundles()
+
+
 def apply_cultural_adaptation(ctx: Context) -> Context:
     """
     Enhance context with cultural adaptation parameters
     """
     region = ctx.user.region
+    level = ctx.content.adaptation_level
     
     # Skip if adaptation level is none
-    if ctx.content.adaptation_level == "none":
-        log.info(f"Cultural adaptation disabled for user from {region}")
+    if level == "none":
+        log.debug(f"Cultural adaptation disabled for user from {region}")
         return ctx
     
-    # Get cultural context for the region
-    cultural_data = CULTURAL_CONTEXTS.get(region, DEFAULT_CONTEXT)
+    bundle = region_bundle(region)
     
     # Set cultural context in content
     if not ctx.content.cultural_context:
-        ctx.content.cultural_context = json.dumps(cultural_data)
+        ctx.content.cultural_context = bundle.json
     
-    # Add user's cultural preferences if they exist
-    if ctx.user.cultural_preferences:
-        log.info(f"Using custom cultural preferences for user {ctx.user.id}")
-    else:
-        # Set default preferences based on region
-        ctx.user.cultural_preferences = {
-            "language": cultural_data["language"],
-            "use_local_examples": "true" if ctx.user.local_examples else "false",
-            "adaptation_level": ctx.content.adaptation_level
-        }
+    # Keep the user's own cultural preferences; otherwise use the region defaults
+    if not ctx.user.cultural_preferences:
+        prefs = bundle.preferences.get((ctx.user.local_examples, level))
+        ctx.user.cultural_preferences = dict(prefs) if prefs is not None else _preferences(bundle.data, ctx.user.local_examples, level)
     
-    log.info(f"Applied cultural adaptation for {region} at level {ctx.content.adaptation_level}")
-    return ctx
\ No newline at end of file
+    log.debug(f"Applied cultural adaptation for {region} at level {level}")
+    return ctx
@@ -1,4 +1,4 @@
-from ..schemas.context import Context
+from schemas.context import Context
 def smooth_difficulty(ctx: Context) -> Context:
     if ctx.content.difficulty not in {"easy","medium","hard"}:
         ctx.content.difficulty = "medium"
@@ -0,0 +1,134 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteStore:
+    """Small persistent key/value table for JSON-serializable values with expiry."""
+
+    def __init__(self, path: str, table: str = "cache"):
+        self.table = table
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str):
+        """Return (value, seconds_left) or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        left = row[1] - time.time()
+        if left <= 0:
+            self.delete(key)
+            return None
+        return json.loads(row[0]), left
+
+    def set(self, key: str, value, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """
+    TTLCache in front of an optional SQLiteStore. Disk hits are promoted into
+    memory with their remaining lifetime so entries survive restarts.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, db_path: str = "", table: str = "cache"):
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize, ttl)
+        self.disk = SQLiteStore(db_path, table) if db_path else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            found = self.disk.get(key)
+            if found is not None:
+                value, left = found
+                self.memory.set(key, value, left)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.memory)}
@@ -0,0 +1,52 @@
+import time
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency. After `failure_threshold` consecutive
+    failures the breaker opens and allow() returns False until
+    `reset_timeout` seconds pass; then a single probe call is let through
+    and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def record_cancelled(self):
+        """A call let through by allow() ended without an outcome; let another probe."""
+        self._probing = False
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures}
@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+
+from utils.tracing import current_trace
+
+# Seconds; covers cache-hit microseconds up to slow LLM completions.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+
+STAGE_SECONDS = Histogram("mcp_stage_seconds", "Time spent in each adaptation stage", ["stage"], buckets=BUCKETS)
+REQUEST_SECONDS = Histogram("mcp_request_seconds", "HTTP request latency until response headers",
+                            ["method", "route", "status"], buckets=BUCKETS)
+CACHE_EVENTS = Counter("mcp_cache_events_total", "Cache lookups by cache and result", ["cache", "result"])
+FALLBACKS = Counter("mcp_fallbacks_total", "Responses served from a fallback instead of the LLM", ["kind"])
+LLM_REQUESTS = Counter("mcp_llm_requests_total", "Upstream LLM attempts by outcome", ["outcome"])
+LLM_TOKENS = Counter("mcp_llm_tokens_total", "Upstream LLM tokens reported in usage", ["kind"])
+
+
+def observe_stage(stage: str, seconds: float, started: float = None):
+    """Record a stage duration in the histogram and, if one is active, the request trace."""
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    trace = current_trace()
+    if trace is not None:
+        trace.add(stage, started if started is not None else time.perf_counter() - seconds, seconds)
+
+
+@contextmanager
+def timed(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started, started)
+
+
+def record_usage(usage: dict):
+    if usage:
+        LLM_TOKENS.labels("prompt").inc(usage.get("prompt_tokens", 0))
+        LLM_TOKENS.labels("completion").inc(usage.get("completion_tokens", 0))
+
+
+class StatsCollector:
+    """
+    Exposes the existing stats() dicts (caches, single-flight, limiter,
+    breaker) at scrape time as mcp_component_stat{component, stat} gauges.
+    """
+
+    def __init__(self):
+        self.sources = {}
+
+    def add(self, component: str, stats_fn):
+        self.sources[component] = stats_fn
+
+    def collect(self):
+        family = GaugeMetricFamily("mcp_component_stat", "Numeric values from component stats()",
+                                   labels=["component", "stat"])
+        for component, stats_fn in self.sources.items():
+            for stat, value in _flatten(stats_fn()):
+                family.add_metric([component, stat], value)
+        yield family
+
+
+def _flatten(stats: dict, prefix: str = ""):
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", float(value)
+
+
+component_stats = StatsCollector()
+REGISTRY.register(component_stats)
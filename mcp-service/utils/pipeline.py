@@ -0,0 +1,86 @@
+import asyncio
+import inspect
+import time
+from typing import Optional
+
+_NO_DEFAULT = object()
+
+
+class Stage:
+    """
+    One pipeline step. `fn(results)` receives the dict of finished stage
+    results (plus the pipeline inputs) and may be sync or async. When the
+    stage has a `timeout` (or the request budget runs out) and a `default`,
+    the default is used as its result instead of failing the request.
+    """
+
+    def __init__(self, name: str, fn, deps=(), timeout: Optional[float] = None, default=_NO_DEFAULT):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.default = default
+
+
+class PipelineResult:
+    def __init__(self, results: dict, timings: dict, timed_out: list, starts: dict = None):
+        self.results = results
+        self.timings = timings  # stage name -> milliseconds
+        self.timed_out = timed_out
+        self.starts = starts or {}  # stage name -> time.perf_counter() when it started
+
+    def server_timing(self) -> str:
+        """Value for a Server-Timing response header."""
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings.items())
+
+
+class Pipeline:
+    """
+    Runs stages as a DAG: every stage starts as soon as its dependencies are
+    done, so independent stages overlap. `budget` bounds the whole run.
+    """
+
+    def __init__(self, stages: list):
+        self.stages = {s.name: s for s in stages}
+        for s in stages:
+            missing = [d for d in s.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"stage {s.name} depends on unknown stages {missing}")
+
+    async def run(self, inputs: dict, budget: Optional[float] = None) -> PipelineResult:
+        started = time.perf_counter()
+        deadline = started + budget if budget is not None else None
+        results = dict(inputs)
+        timings, starts, timed_out = {}, {}, []
+        tasks = {}
+
+        async def run_stage(stage: Stage):
+            for dep in stage.deps:
+                await tasks[dep]
+            timeout = stage.timeout
+            if deadline is not None:
+                left = max(0.0, deadline - time.perf_counter())
+                timeout = left if timeout is None else min(timeout, left)
+            t0 = starts[stage.name] = time.perf_counter()
+            try:
+                value = stage.fn(results)
+                if inspect.isawaitable(value):
+                    value = await asyncio.wait_for(value, timeout) if timeout is not None else await value
+            except asyncio.TimeoutError:
+                if stage.default is _NO_DEFAULT:
+                    raise
+                value = stage.default
+                timed_out.append(stage.name)
+            finally:
+                timings[stage.name] = (time.perf_counter() - t0) * 1000
+            results[stage.name] = value
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        timings["total"] = (time.perf_counter() - started) * 1000
+        return PipelineResult(results, timings, timed_out, starts)
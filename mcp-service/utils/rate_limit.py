@@ -0,0 +1,208 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class QueueTimeout(asyncio.TimeoutError):
+    """A call waited in the limiter queue past its deadline."""
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute up to `capacity`; per_minute <= 0 disables it."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        if self.per_minute <= 0:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if self.per_minute > 0:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        if self.per_minute > 0:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets in front of an API.
+    Callers are admitted in arrival order; one that cannot be admitted
+    before its deadline gets QueueTimeout instead of an upstream 429.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.waiting = 0
+        self.timeouts = 0
+        self._lock = None
+
+    async def acquire(self, tokens: int, deadline: float):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                    if wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        return
+                    if time.monotonic() + wait > deadline:
+                        self.timeouts += 1
+                        raise QueueTimeout("rate limit queue deadline exceeded")
+                    await asyncio.sleep(wait)
+        finally:
+            self.waiting -= 1
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the real usage of a call is known."""
+        if actual > estimated:
+            self.tokens.take(actual - estimated)
+        elif actual < estimated:
+            self.tokens.give(estimated - actual)
+
+    def stats(self) -> dict:
+        return {"waiting": self.waiting, "timeouts": self.timeouts,
+                "request_budget": round(self.requests.level, 1), "token_budget": round(self.tokens.level)}
+
+
+class _Slot:
+    def __init__(self, limiter: "AdaptiveConcurrency", deadline: float):
+        self._limiter = limiter
+        self._deadline = deadline
+        self._started = 0.0
+        self._outcome = None
+
+    def success(self):
+        self._outcome = "success"
+
+    def overloaded(self):
+        self._outcome = "overloaded"
+
+    async def __aenter__(self):
+        await self._limiter.acquire(self._deadline)
+        self._started = time.monotonic()
+        return self
+
+    async def __aexit__(self, *exc):
+        latency = time.monotonic() - self._started
+        if self._outcome == "success":
+            self._limiter.on_success(latency)
+        elif self._outcome == "overloaded":
+            self._limiter.on_overload()
+        await self._limiter.release()
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit: each fast success raises the limit by about one
+    per limit's worth of calls; a 429 or a call slower than `latency_target`
+    halves it (at most once per `cooldown` seconds, so one burst of 429s
+    counts once). Waiters queue until a slot frees up or their deadline.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target: float, cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.timeouts = 0
+        self._decreased_at = 0.0
+        self._cond = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def slot(self, deadline: float) -> _Slot:
+        """`async with limiter.slot(deadline) as slot:` holds one slot; call slot.success()/overloaded()."""
+        return _Slot(self, deadline)
+
+    async def acquire(self, deadline: float):
+        cond = self._condition()
+        async with cond:
+            while self.in_flight >= int(self.limit):
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    self.timeouts += 1
+                    raise QueueTimeout("concurrency queue deadline exceeded")
+                try:
+                    await asyncio.wait_for(cond.wait(), left)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+
+    async def release(self):
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            cond.notify_all()
+
+    def on_success(self, latency: float):
+        if self.latency_target and latency > self.latency_target:
+            self._decrease()
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_overload(self):
+        self._decrease()
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._decreased_at >= self.cooldown:
+            self.limit = max(float(self.minimum), self.limit / 2)
+            self._decreased_at = now
+
+    def stats(self) -> dict:
+        return {"limit": int(self.limit), "in_flight": self.in_flight, "timeouts": self.timeouts}
+
+
+def retry_after(headers) -> Optional[float]:
+    """Seconds to wait from Retry-After (seconds or HTTP date) or retry-after-ms, if present."""
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
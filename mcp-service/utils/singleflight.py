@@ -0,0 +1,34 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one upstream call.
+    The shared call runs as its own task, so a caller that gets cancelled
+    (e.g. a client disconnect) does not cancel it for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced, "inflight": len(self._inflight)}
@@ -0,0 +1,7 @@
+import json
+from typing import Optional
+
+def sse(data: dict, event: Optional[str] = None) -> str:
+    """Format one server-sent event; data is JSON so newlines survive transport."""
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,37 @@
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+_current: ContextVar = ContextVar("trace", default=None)
+
+
+class Trace:
+    """Spans recorded while handling one request; offsets are ms from the request start."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.id = trace_id or uuid.uuid4().hex[:16]
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def add(self, name: str, started: float, seconds: float):
+        self.spans.append({"name": name, "start_ms": round((started - self.started) * 1000, 1),
+                           "dur_ms": round(seconds * 1000, 1)})
+
+    def to_dict(self, **fields) -> dict:
+        return dict(fields, trace_id=self.id, total_ms=round((time.perf_counter() - self.started) * 1000, 1),
+                    spans=sorted(self.spans, key=lambda s: s["start_ms"]))
+
+
+def start_trace(trace_id: Optional[str] = None):
+    """Make a new trace current for this task and the tasks it spawns; returns (trace, reset token)."""
+    trace = Trace(trace_id)
+    return trace, _current.set(trace)
+
+
+def end_trace(token):
+    _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
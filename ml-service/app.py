@@ -1,15 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import numpy as np
-from joblib import dump, load
+from joblib import load
 import os
+import threading
+import time
 
 app = FastAPI(title="EduMorph ML Service")
-MODEL_PATH = "model_registry/default/model.joblib"
-os.makedirs("model_registry/default", exist_ok=True)
-
-SUBJECT_MAP = { 'Math': 0, 'Science': 1, 'English': 2 }
-DIFF_MAP = { 'easy': 0, 'medium': 1, 'hard': 2 }
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "model_registry")
+MODEL_NAME = os.getenv("MODEL_NAME", "default")
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL", "1.0"))
+SCORE_TABLE_ENABLED = os.getenv("SCORE_TABLE", "1").lower() in ("1", "true", "yes")
+SCORE_TABLE_MIN_GRADE = int(os.getenv("SCORE_TABLE_MIN_GRADE", "1"))
+SCORE_TABLE_MAX_GRADE = int(os.getenv("SCORE_TABLE_MAX_GRADE", "12"))
+SAMPLE_BUFFER_DIR = os.getenv("SAMPLE_BUFFER_DIR", "data/buffer")
+INGEST_BATCH_ROWS = int(os.getenv("INGEST_BATCH_ROWS", "10000"))
+TRAIN_BACKGROUND = os.getenv("TRAIN_BACKGROUND", "0").lower() in ("1", "true", "yes")
+TRAIN_WORKERS = int(os.getenv("TRAIN_WORKERS", "1"))
+ML_ESTIMATOR = os.getenv("ML_ESTIMATOR", "knn")
 
 class TrainItem(BaseModel):
     grade: int
@@ -22,30 +31,307 @@ class InferItem(BaseModel):
     subject: str
     difficulty: str
 
-from sklearn.neighbors import KNeighborsRegressor
+from features import SUBJECT_MAP, DIFF_MAP, encode, score_label
+from sample_buffer import SampleBuffer, StreamParser
+from registry import ModelRegistry
+from training import TrainingJobs, UnusableModel, fit_model
+from estimators import ESTIMATORS
+from metrics import INFER_ITEMS, REQUEST_SECONDS, TRAINED_ROWS, timed
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+DEFAULT_SCORE = {"score": 0.5, "label": "neutral"}
+
+
+class ScoreTable:
+    """
+    Dense predictions for every (grade, subject, difficulty) cell of the
+    encoded feature space, so in-range lookups skip the neighbor search.
+    """
+
+    def __init__(self, model, min_grade: int, max_grade: int):
+        self.min_grade = min_grade
+        self.max_grade = max_grade
+        grades = np.arange(min_grade, max_grade + 1)
+        g, sub, d = np.meshgrid(grades, np.arange(len(SUBJECT_MAP)), np.arange(len(DIFF_MAP)), indexing="ij")
+        X = np.stack([g.ravel(), sub.ravel(), d.ravel()], axis=1)
+        self.scores = np.asarray(model.predict(X), dtype=float).reshape(g.shape)
+
+    def lookup(self, x: list):
+        grade, sub, d = x
+        if self.min_grade <= grade <= self.max_grade:
+            return float(self.scores[grade - self.min_grade, sub, d])
+        return None
+
+    def lookup_many(self, X: np.ndarray):
+        """Return (scores, hit_mask); scores are only valid where hit_mask is True."""
+        grades = X[:, 0]
+        hit = (grades >= self.min_grade) & (grades <= self.max_grade)
+        scores = np.empty(len(X), dtype=float)
+        scores[hit] = self.scores[grades[hit] - self.min_grade, X[hit, 1], X[hit, 2]]
+        return scores, hit
+
+
+class ServedModel:
+    """A loaded estimator plus its optional precomputed score table."""
+
+    def __init__(self, model):
+        self.model = model
+        self.table = None
+        if SCORE_TABLE_ENABLED:
+            with timed("score_table"):
+                self.table = ScoreTable(model, SCORE_TABLE_MIN_GRADE, SCORE_TABLE_MAX_GRADE)
+
+    def predict_one(self, x: list) -> float:
+        if self.table is not None:
+            score = self.table.lookup(x)
+            if score is not None:
+                INFER_ITEMS.labels("table").inc()
+                return score
+        INFER_ITEMS.labels("model").inc()
+        return float(self.model.predict(np.array([x]))[0])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.table is None:
+            INFER_ITEMS.labels("model").inc(len(X))
+            return self.model.predict(X)
+        scores, hit = self.table.lookup_many(X)
+        hits = int(hit.sum())
+        INFER_ITEMS.labels("table").inc(hits)
+        if hits < len(X):
+            INFER_ITEMS.labels("model").inc(len(X) - hits)
+            scores[~hit] = self.model.predict(X[~hit])
+        return scores
+
+
+class ModelCache:
+    """
+    Keeps the live model resident in the process.
+    `resolve` returns the path of the live artifact (the registry pointer); it
+    is re-read only when that path or its mtime/size changes, and the
+    (signature, served model) pair is swapped as a single reference so readers
+    never see a half-loaded model.
+    """
+
+    def __init__(self, resolve, check_interval: float = 1.0):
+        self.resolve = resolve
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entry = None  # (signature, ServedModel)
+        self._checked_at = 0.0
+
+    def _signature(self, path=None):
+        path = path or self.resolve()
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size)
+
+    def get(self):
+        entry = self._entry
+        now = time.monotonic()
+        if entry is not None and now - self._checked_at < self.check_interval:
+            return entry[1]
+        sig = self._signature()
+        self._checked_at = now
+        if sig is None:
+            return entry[1] if entry is not None else None
+        if entry is not None and entry[0] == sig:
+            return entry[1]
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry[0] != sig:
+                with timed("model_load"):
+                    model = load(sig[0])
+                entry = (sig, ServedModel(model))
+                self._entry = entry
+        return entry[1]
+
+    def publish(self, served: ServedModel, path: str):
+        """
+        Install a freshly trained model just activated at `path`. The signature
+        comes from that path, not the pointer, so a concurrent activation can
+        never pair this model with another version's signature.
+        """
+        with self._lock:
+            self._entry = (self._signature(path), served)
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Force the next get() to re-resolve the live artifact."""
+        self._checked_at = 0.0
+
+
+registry = ModelRegistry(MODEL_REGISTRY_DIR, MODEL_NAME)
+model_cache = ModelCache(registry.current_model_path, MODEL_CHECK_INTERVAL)
+samples = SampleBuffer(SAMPLE_BUFFER_DIR)
+jobs = TrainingJobs(registry, on_done=lambda version: model_cache.invalidate(), workers=TRAIN_WORKERS)
+
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        REQUEST_SECONDS.labels(request.method, route, str(status)).observe(time.perf_counter() - started)
+
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    jobs.shutdown()
+
+
+def fit_and_publish(X: np.ndarray, y: np.ndarray, estimator: str = ML_ESTIMATOR) -> dict:
+    try:
+        with timed("fit"):
+            model, meta = fit_model(X, y, estimator)
+    except UnusableModel as e:
+        return {"ok": False, "error": str(e)}
+    TRAINED_ROWS.inc(len(X))
+    # Build the served form (score table) before saving, so a model that
+    # cannot serve never becomes a registry version.
+    try:
+        served = ServedModel(model)
+    except Exception as e:
+        return {"ok": False, "error": f"model cannot predict: {e}"}
+    version = registry.save(model, meta)
+    path = registry.activate(version)
+    model_cache.publish(served, path)
+    return {"ok": True, "count": len(X), "model": path, "version": version}
+
+def refit_from_buffer(background: bool = False, estimator: str = ML_ESTIMATOR) -> dict:
+    if samples.count() == 0:
+        return {"ok": False, "error": "no data"}
+    if background:
+        return {"ok": True, "job_id": jobs.submit_buffer(SAMPLE_BUFFER_DIR, estimator), "status": "queued"}
+    X, y = samples.load()
+    return fit_and_publish(X, y, estimator)
 
 @app.post("/train")
-def train(items: list[TrainItem]):
+def train(items: list[TrainItem], append: bool = False, background: bool = TRAIN_BACKGROUND,
+          estimator: str = ML_ESTIMATOR):
+    """
+    Fit from the posted items. With append=true the items are added to the
+    sample buffer and the model is refit on everything accumulated so far.
+    With background=true the fit runs in the training process pool and a
+    job id is returned immediately; poll /train/{job_id} for the result.
+    """
     if not items:
         return {"ok": False, "error": "no data"}
+    if estimator not in ESTIMATORS:
+        return {"ok": False, "error": f"unknown estimator: {estimator}"}
     X, y = [], []
     for it in items:
-        X.append([it.grade, SUBJECT_MAP.get(it.subject,0), DIFF_MAP.get(it.difficulty,1)])
+        X.append(encode(it.grade, it.subject, it.difficulty))
         y.append(it.engagement)
-    model = KNeighborsRegressor(n_neighbors=3)
-    model.fit(np.array(X), np.array(y))
-    dump(model, MODEL_PATH)
-    return {"ok": True, "count": len(X), "model": MODEL_PATH}
+    if append:
+        samples.append(np.array(X, dtype=np.int32), np.array(y, dtype=np.float32))
+        return refit_from_buffer(background, estimator)
+    if background:
+        return {"ok": True, "job_id": jobs.submit_arrays(np.array(X), np.array(y), estimator), "status": "queued"}
+    return fit_and_publish(np.array(X), np.array(y), estimator)
+
+@app.post("/train/ingest")
+async def train_ingest(request: Request, format: str = "", refit: bool = False,
+                       background: bool = TRAIN_BACKGROUND):
+    """
+    Stream NDJSON or CSV rows (grade,subject,difficulty,engagement) into the
+    on-disk sample buffer without holding the whole body in memory.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    if fmt not in ("csv", "ndjson"):
+        return {"ok": False, "error": f"unsupported format: {fmt}"}
+    parser = StreamParser(encode, fmt, INGEST_BATCH_ROWS)
+    ingested = 0
+    try:
+        async for chunk in request.stream():
+            for X, y in parser.feed(chunk):
+                await run_in_threadpool(samples.append, X, y)
+                ingested += len(X)
+        for X, y in parser.close():
+            await run_in_threadpool(samples.append, X, y)
+            ingested += len(X)
+    except (ValueError, KeyError, TypeError) as e:
+        return {"ok": False, "error": f"bad row: {e}", "ingested": ingested, "total": samples.count()}
+    result = {"ok": True, "ingested": ingested, "total": samples.count()}
+    if refit:
+        result["train"] = await run_in_threadpool(refit_from_buffer, background)
+    return result
+
+@app.post("/train/refit")
+def train_refit(background: bool = TRAIN_BACKGROUND, estimator: str = ML_ESTIMATOR):
+    """Refit the model from every sample accumulated in the buffer."""
+    if estimator not in ESTIMATORS:
+        return {"ok": False, "error": f"unknown estimator: {estimator}"}
+    return refit_from_buffer(background, estimator)
+
+@app.get("/train/{job_id}")
+def train_status(job_id: str):
+    status = jobs.status(job_id)
+    if status is None:
+        return {"ok": False, "error": f"unknown job: {job_id}"}
+    return dict(status, ok=True)
 
 @app.post("/infer")
 def infer(it: InferItem):
-    if not os.path.exists(MODEL_PATH):
-        return {"score": 0.5, "label": "neutral"}
-    model = load(MODEL_PATH)
-    X = np.array([[it.grade, SUBJECT_MAP.get(it.subject,0), DIFF_MAP.get(it.difficulty,1)]])
-    score = float(model.predict(X)[0])
-    label = 'low' if score < 0.4 else ('high' if score > 0.7 else 'neutral')
-    return {"score": score, "label": label}
+    served = model_cache.get()
+    if served is None:
+        INFER_ITEMS.labels("default").inc()
+        return dict(DEFAULT_SCORE)
+    with timed("predict"):
+        score = served.predict_one(encode(it.grade, it.subject, it.difficulty))
+    return {"score": score, "label": score_label(score)}
+
+@app.post("/infer/batch")
+def infer_batch(items: list[InferItem]):
+    """Score many items with a single predict call; results keep request order."""
+    if not items:
+        return {"results": []}
+    served = model_cache.get()
+    if served is None:
+        INFER_ITEMS.labels("default").inc(len(items))
+        return {"results": [dict(DEFAULT_SCORE) for _ in items]}
+    X = np.array([encode(it.grade, it.subject, it.difficulty) for it in items])
+    with timed("predict_batch"):
+        scores = served.predict(X)
+    return {"results": [{"score": float(s), "label": score_label(float(s))} for s in scores]}
+
+@app.get("/models")
+def list_models():
+    return {"current": registry.current(), "versions": registry.list_versions()}
+
+@app.get("/models/current")
+def current_model():
+    """Live version id only; cheap enough for clients to poll for cache invalidation."""
+    return {"version": registry.current()}
+
+@app.post("/models/rollback")
+def rollback_model():
+    version = registry.rollback()
+    if version is None:
+        return {"ok": False, "error": "no previous version"}
+    model_cache.invalidate()
+    return {"ok": True, "version": version}
+
+@app.post("/models/{version}/activate")
+def activate_model(version: str):
+    try:
+        registry.activate(version)
+    except KeyError:
+        return {"ok": False, "error": f"unknown version: {version}"}
+    model_cache.invalidate()
+    return {"ok": True, "version": version}
+
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/health")
 def health():
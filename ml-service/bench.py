@@ -0,0 +1,99 @@
+"""
+Estimator benchmark for the ml-service.
+
+Generates synthetic engagement data over the (grade, subject, difficulty)
+feature space and reports, per backend and dataset size: fit time, single-item
+and batch predict latency, serialized model size and held-out error.
+
+    python bench.py --rows 1000,100000,1000000 --estimators knn,knn_kdtree,linear,gbt
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+from joblib import dump
+
+from estimators import ESTIMATORS, make_estimator
+from features import SUBJECT_MAP, DIFF_MAP
+
+
+def synthetic_engagement(rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    grade = rng.integers(1, 13, rows)
+    subject = rng.integers(0, len(SUBJECT_MAP), rows)
+    difficulty = rng.integers(0, len(DIFF_MAP), rows)
+    # Engagement drops with difficulty, varies by subject and peaks mid-grade.
+    base = 0.75 - 0.15 * difficulty + 0.05 * (subject == 2) - 0.004 * (grade - 7) ** 2
+    y = np.clip(base + rng.normal(0, 0.08, rows), 0.0, 1.0)
+    X = np.column_stack([grade, subject, difficulty]).astype(np.int32)
+    return X, y.astype(np.float32)
+
+
+def bench_one(name: str, X_train, y_train, X_test, y_test, single_calls: int, batch_size: int) -> dict:
+    model = make_estimator(name)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - started
+
+    calls = min(single_calls, len(X_test))
+    started = time.perf_counter()
+    for i in range(calls):
+        model.predict(X_test[i:i + 1])
+    single_ms = (time.perf_counter() - started) / calls * 1000
+
+    batch = X_test[:batch_size]
+    started = time.perf_counter()
+    model.predict(batch)
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    pred = model.predict(X_test)
+    err = pred - y_test
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.joblib")
+        dump(model, path)
+        size = os.path.getsize(path)
+
+    return {
+        "estimator": name,
+        "rows": len(X_train) + len(X_test),
+        "fit_s": fit_s,
+        "predict_one_ms": single_ms,
+        "predict_batch_ms": batch_ms,
+        "batch_size": len(batch),
+        "model_bytes": size,
+        "mae": float(np.mean(np.abs(err))),
+        "rmse": float(np.sqrt(np.mean(err ** 2))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", default="1000,100000,1000000")
+    parser.add_argument("--estimators", default=",".join(ESTIMATORS))
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--single-calls", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.estimators.split(",") if n.strip()]
+    if not args.json:
+        print(f"{'estimator':<14}{'rows':>10}{'fit s':>10}{'1 ms':>10}{'batch ms':>10}{'size KB':>10}{'mae':>8}{'rmse':>8}")
+    for rows in (int(r) for r in args.rows.split(",")):
+        X, y = synthetic_engagement(rows, args.seed)
+        split = max(1, int(rows * (1 - args.test_fraction)))
+        for name in names:
+            r = bench_one(name, X[:split], y[:split], X[split:], y[split:], args.single_calls, args.batch_size)
+            if args.json:
+                print(json.dumps(r))
+            else:
+                print(f"{r['estimator']:<14}{r['rows']:>10}{r['fit_s']:>10.3f}{r['predict_one_ms']:>10.3f}"
+                      f"{r['predict_batch_ms']:>10.3f}{r['model_bytes'] / 1024:>10.1f}{r['mae']:>8.4f}{r['rmse']:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neighbors import KNeighborsRegressor
+
+# name -> factory. "knn" keeps the original brute/auto KNN behaviour.
+ESTIMATORS = {
+    "knn": lambda: KNeighborsRegressor(n_neighbors=3),
+    "knn_kdtree": lambda: KNeighborsRegressor(n_neighbors=3, algorithm="kd_tree"),
+    "knn_balltree": lambda: KNeighborsRegressor(n_neighbors=3, algorithm="ball_tree"),
+    "linear": lambda: Ridge(alpha=1.0),
+    "gbt": lambda: HistGradientBoostingRegressor(max_iter=100),
+}
+
+
+def make_estimator(name: str):
+    try:
+        return ESTIMATORS[name]()
+    except KeyError:
+        raise ValueError(f"unknown estimator: {name} (choose from {', '.join(ESTIMATORS)})")
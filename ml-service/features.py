@@ -0,0 +1,10 @@
+SUBJECT_MAP = { 'Math': 0, 'Science': 1, 'English': 2 }
+DIFF_MAP = { 'easy': 0, 'medium': 1, 'hard': 2 }
+
+
+def encode(grade: int, subject: str, difficulty: str) -> list:
+    return [grade, SUBJECT_MAP.get(subject,0), DIFF_MAP.get(difficulty,1)]
+
+
+def score_label(score: float) -> str:
+    return 'low' if score < 0.4 else ('high' if score > 0.7 else 'neutral')
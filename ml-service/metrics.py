@@ -0,0 +1,21 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Histogram
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram("ml_stage_seconds", "Time spent in model load, score table build, predict and fit",
+                          ["stage"], buckets=BUCKETS)
+REQUEST_SECONDS = Histogram("ml_request_seconds", "HTTP request latency", ["method", "route", "status"], buckets=BUCKETS)
+INFER_ITEMS = Counter("ml_infer_items_total", "Scored items by where the score came from", ["source"])
+TRAINED_ROWS = Counter("ml_trained_rows_total", "Rows used by synchronous fits")
+
+
+@contextmanager
+def timed(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+from joblib import dump
+
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+
+
+class ModelRegistry:
+    """
+    Versioned model store.
+
+    <root>/<name>/versions/<version>/{model.joblib,meta.json} are written once
+    and never modified. <root>/<name>/CURRENT names the live version and is
+    replaced atomically; history.json records activations for rollback.
+    """
+
+    def __init__(self, root: str, name: str = "default"):
+        self.root = root
+        self.name = name
+        self.base = os.path.join(root, name)
+        self.versions_dir = os.path.join(self.base, "versions")
+        self._lock = threading.Lock()
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def _pointer_path(self) -> str:
+        return os.path.join(self.base, "CURRENT")
+
+    def _history_path(self) -> str:
+        return os.path.join(self.base, "history.json")
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def _write_atomic(self, path: str, text: str):
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def _history(self) -> list:
+        try:
+            with open(self._history_path()) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def exists(self, version: str) -> bool:
+        if not version or version.startswith(".") or os.sep in version or "/" in version:
+            return False
+        return os.path.exists(os.path.join(self._version_dir(version), MODEL_FILE))
+
+    def current(self):
+        try:
+            with open(self._pointer_path()) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current_model_path(self):
+        version = self.current()
+        if version is not None:
+            return os.path.join(self._version_dir(version), MODEL_FILE)
+        # Artifacts written before the registry existed live directly under <name>/
+        legacy = os.path.join(self.base, MODEL_FILE)
+        return legacy if os.path.exists(legacy) else None
+
+    def metadata(self, version: str) -> dict:
+        try:
+            with open(os.path.join(self._version_dir(version), META_FILE)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"version": version}
+
+    def save(self, model, meta: dict) -> str:
+        """Write a new immutable version directory and return its id (not yet live)."""
+        version = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + "-" + uuid.uuid4().hex[:6]
+        final_dir = self._version_dir(version)
+        tmp_dir = f"{final_dir}.tmp"
+        os.makedirs(tmp_dir)
+        dump(model, os.path.join(tmp_dir, MODEL_FILE))
+        meta = dict(meta, version=version, created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+        with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+        os.rename(tmp_dir, final_dir)
+        return version
+
+    def activate(self, version: str) -> str:
+        if not self.exists(version):
+            raise KeyError(version)
+        with self._lock:
+            self._write_atomic(self._pointer_path(), version)
+            history = self._history()
+            history.append(version)
+            self._write_atomic(self._history_path(), json.dumps(history))
+        return os.path.join(self._version_dir(version), MODEL_FILE)
+
+    def rollback(self):
+        """Re-activate the version that was live before the current one."""
+        with self._lock:
+            history = self._history()
+            current = self.current()
+            while history and history[-1] == current:
+                history.pop()
+            while history and not self.exists(history[-1]):
+                history.pop()
+            if not history:
+                return None
+            version = history[-1]
+            self._write_atomic(self._pointer_path(), version)
+            self._write_atomic(self._history_path(), json.dumps(history))
+        return version
+
+    def list_versions(self) -> list:
+        current = self.current()
+        versions = sorted(
+            (v for v in os.listdir(self.versions_dir) if not v.endswith(".tmp") and self.exists(v)),
+            reverse=True,
+        )
+        return [dict(self.metadata(v), version=v, active=(v == current)) for v in versions]
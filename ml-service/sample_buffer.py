@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+import os
+import threading
+
+import numpy as np
+
+# One append-only file per column; meta.json holds the committed row count so a
+# torn write at the tail is ignored (and truncated away on the next append).
+COLUMNS = {
+    "grade": np.int32,
+    "subject": np.int8,
+    "difficulty": np.int8,
+    "engagement": np.float32,
+}
+
+
+class SampleBuffer:
+    """Columnar on-disk store of encoded training samples."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def count(self) -> int:
+        try:
+            with open(self._meta_path()) as f:
+                return int(json.load(f).get("rows", 0))
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_count(self, rows: int):
+        tmp = self._meta_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"rows": rows}, f)
+        os.replace(tmp, self._meta_path())
+
+    def append(self, X: np.ndarray, y: np.ndarray) -> int:
+        """Append encoded rows (X: n x 3, y: n) and return the new total."""
+        if len(X) == 0:
+            return self.count()
+        cols = {
+            "grade": X[:, 0],
+            "subject": X[:, 1],
+            "difficulty": X[:, 2],
+            "engagement": y,
+        }
+        with self._lock:
+            rows = self.count()
+            for name, dtype in COLUMNS.items():
+                with open(self._column_path(name), "ab") as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize)
+                    f.write(np.ascontiguousarray(cols[name], dtype=dtype).tobytes())
+            rows += len(X)
+            self._write_count(rows)
+        return rows
+
+    def load(self):
+        """Return (X, y) memory-mapped from disk, or (None, None) when empty."""
+        rows = self.count()
+        if rows == 0:
+            return None, None
+        cols = {
+            name: np.memmap(self._column_path(name), dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in COLUMNS.items()
+        }
+        X = np.column_stack([cols["grade"], cols["subject"], cols["difficulty"]])
+        return X, cols["engagement"]
+
+    def clear(self):
+        with self._lock:
+            for name in COLUMNS:
+                try:
+                    os.remove(self._column_path(name))
+                except FileNotFoundError:
+                    pass
+            self._write_count(0)
+
+
+class StreamParser:
+    """
+    Incrementally parses NDJSON or CSV (header: grade,subject,difficulty,engagement)
+    from byte chunks and yields encoded (X, y) batches of at most `batch_rows`.
+    """
+
+    def __init__(self, encode, fmt: str, batch_rows: int = 10000):
+        self.encode = encode
+        self.fmt = fmt
+        self.batch_rows = batch_rows
+        self._pending = b""
+        self._header = None
+        self._X, self._y = [], []
+
+    def _parse_line(self, line: str):
+        if self.fmt == "ndjson":
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f"expected a JSON object, got {type(row).__name__}")
+        else:
+            values = next(csv.reader(io.StringIO(line)))
+            if self._header is None:
+                self._header = [v.strip() for v in values]
+                if "engagement" in self._header:
+                    return
+                self._header = list(COLUMNS)
+            row = dict(zip(self._header, values))
+        self._X.append(self.encode(int(row["grade"]), row["subject"], row["difficulty"]))
+        self._y.append(float(row["engagement"]))
+
+    def _flush(self, force: bool = False):
+        if self._X and (force or len(self._X) >= self.batch_rows):
+            batch = (np.array(self._X, dtype=np.int32), np.array(self._y, dtype=np.float32))
+            self._X, self._y = [], []
+            return batch
+        return None
+
+    def feed(self, chunk: bytes):
+        lines = (self._pending + chunk).split(b"\n")
+        self._pending = lines.pop()
+        for raw in lines:
+            line = raw.decode("utf-8").strip()
+            if line:
+                self._parse_line(line)
+                batch = self._flush()
+                if batch is not None:
+                    yield batch
+
+    def close(self):
+        line = self._pending.decode("utf-8").strip()
+        self._pending = b""
+        if line:
+            self._parse_line(line)
+        batch = self._flush(force=True)
+        if batch is not None:
+            yield batch
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Service modules import each other from the ml-service root (as uvicorn runs them).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py keeps its model store under the working directory; keep test runs out of the tree.
+os.chdir(tempfile.mkdtemp(prefix="ml-service-tests-"))
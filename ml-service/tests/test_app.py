@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+from sklearn.neighbors import KNeighborsRegressor
+
+import app
+
+client = TestClient(app.app)
+
+
+def _items(grades):
+    return [{"grade": g, "subject": s, "difficulty": d}
+            for g in grades for s in app.SUBJECT_MAP for d in app.DIFF_MAP]
+
+
+def _train(grades=range(1, 13)):
+    items = [dict(it, engagement=(it["grade"] % 5) / 5) for it in _items(grades)]
+    return client.post("/train", json=items).json()
+
+
+def test_score_table_matches_model_predict():
+    X = np.array([[g, s, d] for g in range(1, 13) for s in range(3) for d in range(3)])
+    model = KNeighborsRegressor(n_neighbors=3).fit(X, (X[:, 0] % 5) / 5 + X[:, 2] / 10)
+    table = app.ScoreTable(model, 1, 12)
+    scores, hit = table.lookup_many(X)
+    assert hit.all() and np.allclose(scores, model.predict(X))
+    assert table.lookup([13, 0, 0]) is None
+
+
+def test_infer_batch_keeps_request_order():
+    assert _train()["ok"]
+    items = _items([12, 3, 20, 1])  # grade 20 is outside the score table
+    batch = client.post("/infer/batch", json=items).json()["results"]
+    single = [client.post("/infer", json=it).json() for it in items]
+    assert batch == single
+
+
+def test_model_that_cannot_predict_is_not_activated():
+    assert _train()["ok"]
+    live = client.get("/models/current").json()["version"]
+    two_rows = [{"grade": 3, "subject": "Math", "difficulty": "easy", "engagement": 0.5}] * 2
+    result = client.post("/train", json=two_rows).json()
+    assert result["ok"] is False and "version" not in result
+    assert client.get("/models/current").json()["version"] == live
+    assert all(v["samples"] != 2 for v in client.get("/models").json()["versions"])
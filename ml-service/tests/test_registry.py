@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("joblib")
+
+from registry import ModelRegistry
+
+
+def test_activate_and_rollback(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    first = registry.save({"w": 1}, {"samples": 1})
+    second = registry.save({"w": 2}, {"samples": 2})
+    assert registry.current() is None
+
+    registry.activate(first)
+    path = registry.activate(second)
+    assert registry.current() == second and path == registry.current_model_path()
+    assert [v["active"] for v in registry.list_versions() if v["version"] == second] == [True]
+
+    assert registry.rollback() == first
+    assert registry.current() == first
+    assert registry.rollback() is None and registry.current() == first
+
+
+def test_activate_unknown_version_raises(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    with pytest.raises(KeyError):
+        registry.activate("missing")
+    with pytest.raises(KeyError):
+        registry.activate("../escape")
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from features import encode
+from sample_buffer import SampleBuffer, StreamParser
+
+
+def _rows(n, start=0):
+    X = np.array([[start + i, 1, 2] for i in range(n)], dtype=np.int32)
+    return X, np.linspace(0, 1, n, dtype=np.float32)
+
+
+def test_append_and_load(tmp_path):
+    buf = SampleBuffer(str(tmp_path))
+    X, y = _rows(3)
+    assert buf.append(X, y) == 3
+    assert buf.append(*_rows(2, start=10)) == 5
+    loaded_X, loaded_y = buf.load()
+    assert loaded_X[:, 0].tolist() == [0, 1, 2, 10, 11]
+    assert np.allclose(loaded_y[:3], y)
+
+
+def test_torn_tail_is_ignored_then_truncated(tmp_path):
+    buf = SampleBuffer(str(tmp_path))
+    buf.append(*_rows(3))
+    # A crash mid-append leaves extra bytes in some column files but no new row count.
+    with open(buf._column_path("grade"), "ab") as f:
+        f.write(np.array([99, 99], dtype=np.int32).tobytes())
+    with open(buf._column_path("engagement"), "ab") as f:
+        f.write(b"\x01\x02")
+
+    X, _ = buf.load()
+    assert X[:, 0].tolist() == [0, 1, 2]
+
+    buf.append(*_rows(1, start=7))
+    X, y = buf.load()
+    assert X[:, 0].tolist() == [0, 1, 2, 7] and len(y) == 4
+
+
+def test_stream_parser_rejects_non_object_rows():
+    parser = StreamParser(encode, "ndjson")
+    with pytest.raises(ValueError):
+        list(parser.feed(b"[1, 2]\n"))
@@ -0,0 +1,77 @@
+from concurrent.futures import Future
+
+from training import TrainingJobs
+
+
+class FakeRegistry:
+    root, name = "unused", "default"
+
+    def __init__(self):
+        self.activated = []
+        self.pointer = None
+
+    def current(self):
+        return self.pointer
+
+    def activate(self, version):
+        self.activated.append(version)
+        self.pointer = version
+
+
+def _done(version):
+    future = Future()
+    future.set_result({"version": version, "count": 1})
+    return future
+
+
+def _failed(error):
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+def test_finished_job_is_activated_and_reported():
+    registry, notified = FakeRegistry(), []
+    jobs = TrainingJobs(registry, notified.append)
+    job = {"seq": 1, "base": None, "result": None, "error": None, "finished_at": None}
+    jobs._finish(job, _done("v1"))
+    assert registry.activated == ["v1"] and notified == ["v1"]
+    assert job["result"]["version"] == "v1" and job["finished_at"] is not None
+
+
+def test_failed_job_records_error_without_activating():
+    registry, notified = FakeRegistry(), []
+    jobs = TrainingJobs(registry, notified.append)
+    job = {"seq": 1, "base": None, "result": None, "error": None, "finished_at": None}
+    jobs._finish(job, _failed(ValueError("no data")))
+    assert registry.activated == [] and notified == []
+    assert job["error"] == "no data"
+
+
+def test_older_job_finishing_late_does_not_replace_newer_model():
+    registry, notified = FakeRegistry(), []
+    jobs = TrainingJobs(registry, notified.append)
+    older, newer = {"seq": 1, "base": None}, {"seq": 2, "base": None}
+    jobs._finish(newer, _done("new"))
+    jobs._finish(older, _done("old"))
+    assert registry.activated == ["new"] and notified == ["new"]
+    assert older["result"]["superseded"] and older["finished_at"] is not None
+
+
+def test_jobs_submitted_together_activate_in_turn():
+    registry = FakeRegistry()
+    jobs = TrainingJobs(registry, lambda version: None)
+    first, second = {"seq": 1, "base": None}, {"seq": 2, "base": None}
+    jobs._finish(first, _done("a"))
+    jobs._finish(second, _done("b"))
+    assert registry.activated == ["a", "b"]
+
+
+def test_operator_activation_is_not_undone_by_a_running_job():
+    registry, notified = FakeRegistry(), []
+    jobs = TrainingJobs(registry, notified.append)
+    job = {"seq": 1, "base": None}
+    registry.pointer = "chosen"  # /models/chosen/activate while the job was running
+    jobs._finish(job, _done("fit"))
+    assert registry.activated == [] and notified == []
+    assert job["result"]["superseded"] and registry.current() == "chosen"
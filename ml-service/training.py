@@ -0,0 +1,149 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from estimators import make_estimator
+from features import SUBJECT_MAP, DIFF_MAP
+from registry import ModelRegistry
+from sample_buffer import SampleBuffer
+
+
+class UnusableModel(ValueError):
+    """A fitted model failed to predict (e.g. KNN fitted on fewer rows than n_neighbors)."""
+
+
+def fit_model(X: np.ndarray, y: np.ndarray, estimator: str = "knn"):
+    """Fit a model and predict one row with it; returns (model, registry metadata)."""
+    model = make_estimator(estimator)
+    started = time.perf_counter()
+    model.fit(X, y)
+    fit_seconds = time.perf_counter() - started
+    try:
+        model.predict(X[:1])
+    except Exception as e:
+        raise UnusableModel(f"model cannot predict: {e}") from e
+    return model, {
+        "samples": len(X),
+        "fit_seconds": round(fit_seconds, 6),
+        "estimator": estimator,
+        "estimator_class": type(model).__name__,
+        "subject_map": SUBJECT_MAP,
+        "difficulty_map": DIFF_MAP,
+    }
+
+
+def fit_version(registry: ModelRegistry, X: np.ndarray, y: np.ndarray, estimator: str = "knn"):
+    """Fit a model and store it as a new (not yet active) registry version; nothing is saved if it cannot predict."""
+    model, meta = fit_model(X, y, estimator)
+    return model, registry.save(model, meta)
+
+
+# Entry points executed inside the worker process. They only return the
+# version id; the parent activates it once the job finishes.
+
+def _fit_arrays_job(registry_dir: str, model_name: str, X: np.ndarray, y: np.ndarray, estimator: str) -> dict:
+    _, version = fit_version(ModelRegistry(registry_dir, model_name), X, y, estimator)
+    return {"version": version, "count": len(X)}
+
+
+def _fit_buffer_job(registry_dir: str, model_name: str, buffer_dir: str, estimator: str) -> dict:
+    X, y = SampleBuffer(buffer_dir).load()
+    if X is None:
+        raise ValueError("no data")
+    _, version = fit_version(ModelRegistry(registry_dir, model_name), X, y, estimator)
+    return {"version": version, "count": len(X)}
+
+
+class TrainingJobs:
+    """
+    Runs fits in a process pool so /train never blocks an inference worker.
+    `on_done(version)` is called in the parent when a job succeeds. A job is
+    activated only if nothing newer has gone live since it was submitted: a
+    later job, a sync /train, or an operator's activate/rollback. Otherwise
+    its version is kept in the registry, not activated, and marked superseded.
+    """
+
+    def __init__(self, registry: ModelRegistry, on_done, workers: int = 1, keep: int = 100):
+        self.registry = registry
+        self.on_done = on_done
+        self.workers = workers
+        self.keep = keep
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._activated = 0
+        self._last_version = None  # the version this pool last made current
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _submit(self, fn, *args) -> str:
+        job_id = uuid.uuid4().hex
+        job = {"id": job_id, "submitted_at": time.time(), "finished_at": None,
+               "result": None, "error": None, "future": None}
+        with self._lock:
+            self._submitted += 1
+            job["seq"] = self._submitted
+            job["base"] = self.registry.current()
+            job["future"] = self._pool().submit(fn, self.registry.root, self.registry.name, *args)
+            self._jobs[job_id] = job
+            self._trim()
+        job["future"].add_done_callback(lambda f: self._finish(job, f))
+        return job_id
+
+    def _finish(self, job: dict, future):
+        try:
+            result = future.result()
+            with self._lock:
+                # The pointer may only have moved by this pool's own activations.
+                current = self.registry.current()
+                superseded = job["seq"] < self._activated or current not in (job["base"], self._last_version)
+                if not superseded:
+                    self.registry.activate(result["version"])
+                    self._activated = job["seq"]
+                    self._last_version = result["version"]
+            if superseded:
+                result["superseded"] = True
+            else:
+                self.on_done(result["version"])
+            job["result"] = result
+        except Exception as e:
+            job["error"] = str(e) or type(e).__name__
+        job["finished_at"] = time.time()
+
+    def _trim(self):
+        finished = [j for j in self._jobs.values() if j["finished_at"] is not None]
+        for j in sorted(finished, key=lambda j: j["submitted_at"])[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[j["id"]]
+
+    def submit_arrays(self, X: np.ndarray, y: np.ndarray, estimator: str) -> str:
+        return self._submit(_fit_arrays_job, X, y, estimator)
+
+    def submit_buffer(self, buffer_dir: str, estimator: str) -> str:
+        return self._submit(_fit_buffer_job, buffer_dir, estimator)
+
+    def status(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job["finished_at"] is not None:
+            state = "failed" if job["error"] else "succeeded"
+        elif job["future"].running():
+            state = "running"
+        else:
+            state = "queued"
+        out = {k: v for k, v in job.items() if k != "future"}
+        out["status"] = state
+        return out
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)